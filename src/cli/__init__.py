@@ -1,5 +1,25 @@
 """CLI package for fix-compile."""
 
-from .main import app, main
+import importlib
+
+# 懒加载 (PEP 562)：`import cli` 不再连带导入 typer；入口见 cli.launcher
+_LAZY: dict[str, tuple[str, str]] = {
+    "app": ("cli.main", "app"),
+    "main": ("cli.launcher", "main"),
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY:
+        module_name, attr = _LAZY[name]
+        module = importlib.import_module(module_name)
+        if name == "app":
+            # 程序化使用（如 CliRunner）没有 argv 可参考，注册全部子命令
+            module._register_subapps([])
+        obj = getattr(module, attr)
+        globals()[name] = obj
+        return obj
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = ["app", "main"]
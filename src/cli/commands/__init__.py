@@ -3,7 +3,22 @@ Sub commands
 Implemented via sub typers in Typer.
 """
 
-from .config import config_app
-from .docker import docker_app
+import importlib
+
+# 懒加载 (PEP 562)：只有实际调用的子命令模块才会被导入
+_LAZY: dict[str, tuple[str, str]] = {
+    "config_app": ("cli.commands.config", "config_app"),
+    "docker_app": ("cli.commands.docker", "docker_app"),
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY:
+        module_name, attr = _LAZY[name]
+        obj = getattr(importlib.import_module(module_name), attr)
+        globals()[name] = obj
+        return obj
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = ["config_app", "docker_app"]
@@ -1,11 +1,16 @@
 """Config CLI"""
 
+from typing import Literal
+
 import typer
-from rich.table import Table
 
 from fix_compile.config import Configs, config_service
 from fix_compile.utils.ui import console, error, info, success, warning
 
+# 可通过 CLI 修改的配置项（dir_configs 由平台目录决定，不开放）
+_VALID_KEYS: frozenset[str] = frozenset(Configs.model_fields) - {"dir_configs"}
+_VALID_KEYS_SORTED: str = ", ".join(sorted(_VALID_KEYS))
+
 # ============================================================================
 # Command: config (Configuration Management)
 # ============================================================================
@@ -14,52 +19,64 @@ from fix_compile.utils.ui import console, error, info, success, warning
 config_app = typer.Typer(help="Manage configuration for fix-compile")
 
 
-@config_app.command(name="set")
-def config_set(
-    key: str = typer.Argument(..., help="Configuration key"),
-    value: str = typer.Argument(..., help="Configuration value"),
-):
-    """Set a configuration value."""
-    valid_keys = Configs.model_fields.keys() - {"dir_configs"}
-    if key not in valid_keys:
+def _config_op(op: Literal["set", "get", "delete"], key: str, value=None) -> None:
+    """Shared skeleton of config set/get/delete: validate key, load, apply op."""
+    if key not in _VALID_KEYS:
         error(f"Invalid configuration key: {key}")
-        info(f"Valid keys: {', '.join(sorted(valid_keys))}")
+        info(f"Valid keys: {_VALID_KEYS_SORTED}")
         raise typer.Exit(1)
 
     try:
         config_service.load_config()
         config = config_service.config
+
+        if op == "get":
+            info(f"Configuration value for {key}: {getattr(config, key)}")
+            return
+
         setattr(config, key, value)
         config_service.save_config()
-
-        success(f"Configuration saved: {key} = {value}")
+        if op == "set":
+            success(f"Configuration saved: {key} = {value}")
+        else:
+            success(f"Configuration deleted: {key}")
     except Exception as e:
-        error(f"Failed to save configuration: {e}")
+        action = "read" if op == "get" else op
+        error(f"Failed to {action} configuration: {e}")
         raise typer.Exit(1)
 
 
+@config_app.command(name="set")
+def config_set(
+    key: str = typer.Argument(..., help="Configuration key"),
+    value: str = typer.Argument(..., help="Configuration value"),
+):
+    """Set a configuration value."""
+    _config_op("set", key, value)
+
+
 @config_app.command(name="get")
 def config_get(key: str = typer.Argument(..., help="Configuration key")):
     """Get a configuration value."""
-    valid_keys = Configs.model_fields.keys() - {"dir_configs"}
-    if key not in valid_keys:
-        error(f"Invalid configuration key: {key}")
-        raise typer.Exit(1)
-
-    try:
-        config_service.load_config()
-        config = config_service.config
-        value = getattr(config, key)
-        info(f"Configuration value for {key}: {value}")
-    except Exception as e:
-        error(f"Failed to read configuration: {e}")
-        raise typer.Exit(1)
+    _config_op("get", key)
 
 
 @config_app.command(name="list")
 def config_list():
     """List all configuration values."""
     try:
+        config_service.load_config()
+        config = config_service.config
+        values = config.model_dump(exclude={"dir_configs"})
+
+        # Piped output: plain key=value lines, skip rich table rendering
+        if not console.is_terminal:
+            for key, value in values.items():
+                typer.echo(f"{key}={value}")
+            return
+
+        from rich.table import Table
+
         # Create table
         table = Table(
             title="Configuration Values",
@@ -69,12 +86,7 @@ def config_list():
         table.add_column("Key", style="green")
         table.add_column("Value", style="white")
 
-        # Load and display config
-        config_service.load_config()
-        config = config_service.config
-        for key, value in config.model_dump(
-            exclude={"dir_configs"},
-        ).items():
+        for key, value in values.items():
             table.add_row(key, str(value))
 
         console.print(table)
@@ -90,26 +102,12 @@ def config_delete(
     confirm: bool = typer.Option(False, "--yes", "-y", help="Skip confirmation"),
 ):
     """Delete a configuration value."""
-    valid_keys = Configs.model_fields.keys() - {"dir_configs"}
-    if key not in valid_keys:
-        error(f"Invalid configuration key: {key}")
-        raise typer.Exit(1)
-
-    try:
-        if not confirm:
-            if not typer.confirm(f"Delete configuration key '{key}'?"):
-                warning("Cancelled")
-                return
+    if key in _VALID_KEYS and not confirm:
+        if not typer.confirm(f"Delete configuration key '{key}'?"):
+            warning("Cancelled")
+            return
 
-        config_service.load_config()
-        config = config_service.config
-
-        setattr(config, key, None)
-        config_service.save_config()
-        success(f"Configuration deleted: {key}")
-    except Exception as e:
-        error(f"Failed to delete configuration: {e}")
-        raise typer.Exit(1)
+    _config_op("delete", key)
 
 
 @config_app.command(name="profile")
@@ -118,20 +116,27 @@ def config_profile():
     config_service.load_config()
     dir_config = config_service.config.dir_configs
 
-    table = Table(
-        title="Configuration Profile", show_header=True, header_style="bold cyan"
-    )
-    table.add_column("Type", style="green")
-    table.add_column("Path", style="white")
-
     # Placeholder values
     config_file = dir_config.config_file
     config_dir = dir_config.config_dir
 
-    table.add_row("Config File", str(config_file))
-    table.add_row("Config Directory", str(config_dir))
+    # Piped output: plain key=value lines, skip rich table rendering
+    if not console.is_terminal:
+        typer.echo(f"config_file={config_file}")
+        typer.echo(f"config_dir={config_dir}")
+    else:
+        from rich.table import Table
+
+        table = Table(
+            title="Configuration Profile", show_header=True, header_style="bold cyan"
+        )
+        table.add_column("Type", style="green")
+        table.add_column("Path", style="white")
+
+        table.add_row("Config File", str(config_file))
+        table.add_row("Config Directory", str(config_dir))
 
-    console.print(table)
+        console.print(table)
 
     if config_file.exists():
         info(f"Config file exists at: {config_file}")
@@ -5,7 +5,8 @@ from pathlib import Path
 import typer
 
 from fix_compile.config import config_service
-from fix_compile.workflows.docker_fixer import DockerFixer
+from fix_compile.schema import DockerBuildConfig
+from fix_compile.utils.ui import error
 
 docker_app = typer.Typer(help="Docker tools with auto-fix capabilities")
 
@@ -22,6 +23,24 @@ def build(
     force: bool = typer.Option(
         False, "--force", help="Force re-execution (ignore cached logs)"
     ),
+    cache_from: list[str] | None = typer.Option(
+        None,
+        "--cache-from",
+        help="External cache source, e.g. type=local,src=DIR (repeatable, BuildKit)",
+    ),
+    cache_to: str | None = typer.Option(
+        None,
+        "--cache-to",
+        help="Cache export target, e.g. type=local,dest=DIR (BuildKit)",
+    ),
+    buildkit: bool | None = typer.Option(
+        None,
+        "--buildkit/--no-buildkit",
+        help=(
+            "Build with BuildKit (default: on with --cache-from/--cache-to,"
+            " otherwise the DOCKER_BUILDKIT config key)"
+        ),
+    ),
     dev: bool = typer.Option(False, "--dev", help="Dev mode"),
 ):
     """
@@ -37,11 +56,31 @@ def build(
     config_service.load_config(dev_mode=dev)
     config = config_service.config
 
+    # External cache import/export is BuildKit-only; the legacy builder
+    # rejects --cache-to and type=... specs
+    use_cache = bool(cache_from or cache_to)
+    if use_cache and buildkit is False:
+        error("--cache-from/--cache-to require BuildKit; drop --no-buildkit")
+        raise typer.Exit(1)
+    if buildkit is None:
+        buildkit = use_cache or config.DOCKER_BUILDKIT
+
     # 2. Reconstruct Command
-    # Manually add tag and file back, plus any extra args from ctx.args
-    cmd = ["docker", "build", "-t", tag, "-f", str(file)] + list(ctx.args)
+    # Options come from the build config, plus any extra args from ctx.args
+    from fix_compile.executor import Executor
+
+    build_config = DockerBuildConfig(
+        dockerfile=str(file),
+        tag=tag,
+        cache_from=cache_from or [],
+        cache_to=cache_to,
+        buildkit=buildkit,
+    )
+    cmd = ["docker", "build", *Executor.docker_build_args(build_config), *ctx.args]
 
     # 3. Run Pipeline
+    from fix_compile.workflows.docker_fixer import DockerFixer
+
     fixer = DockerFixer(config)
     fixer.run_pipeline(
         cmd=cmd,
@@ -49,6 +88,7 @@ def build(
         dockerfile_path=file,
         no_fix=no_fix,
         force_rerun=force,
+        build_config=build_config,
     )
 
 
@@ -78,9 +118,11 @@ def run(
     config = config_service.config
 
     # 2. Reconstruct Command
-    cmd = ["docker", "run"] + list(ctx.args)
+    cmd = ["docker", "run", *ctx.args]
 
     # 3. Run Pipeline
+    from fix_compile.workflows.docker_fixer import DockerFixer
+
     fixer = DockerFixer(config)
     fixer.run_pipeline(
         cmd=cmd,
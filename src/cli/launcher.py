@@ -0,0 +1,27 @@
+"""Lightweight console entry point for fix-compile.
+
+Handles the trivial invocations (version) using only the standard library,
+so they never import Typer, Rich or pydantic. Everything else is forwarded
+to :func:`cli.main.main`.
+"""
+
+import sys
+
+_VERSION_ARGS = frozenset({"version", "--version", "-V"})
+
+
+def main() -> None:
+    """Entry point for the CLI."""
+    if len(sys.argv) == 2 and sys.argv[1] in _VERSION_ARGS:
+        from fix_compile._version import __version__
+
+        print(f"fix_compile version {__version__}")
+        return
+
+    from cli.main import main as _main
+
+    _main()
+
+
+if __name__ == "__main__":
+    main()
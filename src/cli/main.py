@@ -1,17 +1,15 @@
 """Main CLI application for fix-compile (new unified CLI)."""
 
 import json
-import shlex
+import os
+import sys
 from pathlib import Path
-from typing import List, Optional
 
 import typer
 
-from cli.commands import config_app, docker_app
 from fix_compile.config import config_service
 from fix_compile.constants import PROJECT_NAME
-from fix_compile.executor import ExecutionError, Executor
-from fix_compile.utils.io import cmd2hash, save_exec_output
+from fix_compile.utils import ui
 from fix_compile.utils.ui import (
     console,
     error,
@@ -20,7 +18,6 @@ from fix_compile.utils.ui import (
     success,
     warning,
 )
-from fix_compile.workflows.general_fixer import GeneralFixer
 
 app = typer.Typer(
     name=PROJECT_NAME,
@@ -32,9 +29,32 @@ app = typer.Typer(
 # -------------------------------
 # Sub-Apps
 # -------------------------------
-
-app.add_typer(config_app, name="config")
-app.add_typer(docker_app, name="docker")
+# Registered lazily in main(): `fix-compile fix ...` never imports the config
+# or docker sub-command modules. Help listings still register all of them, and
+# so does fetching `cli.app` for programmatic use (see cli/__init__.py).
+_SUBAPPS: dict[str, str] = {
+    "config": "config_app",
+    "docker": "docker_app",
+}
+
+
+def _register_subapps(argv: list[str]) -> None:
+    """Register the sub-apps needed for this invocation (idempotent)."""
+    requested = argv[1] if len(argv) > 1 else None
+    top_level = {
+        cmd.name or cmd.callback.__name__.replace("_", "-")
+        for cmd in app.registered_commands
+    }
+    if requested in top_level:
+        return
+
+    import cli.commands
+
+    registered = {group.name for group in app.registered_groups}
+    for name, attr in _SUBAPPS.items():
+        if name in registered or (requested in _SUBAPPS and requested != name):
+            continue
+        app.add_typer(getattr(cli.commands, attr), name=name)
 
 
 # -------------------------------
@@ -47,26 +67,30 @@ app.add_typer(docker_app, name="docker")
     no_args_is_help=True,
 )
 def exec_command(
-    cmd: List[str] = typer.Argument(..., help="Command to execute"),
-    cwd: Optional[Path] = typer.Option(None, "--cwd", help="Working directory"),
+    cmd: list[str] = typer.Argument(..., help="Command to execute"),
+    cwd: Path | None = typer.Option(None, "--cwd", help="Working directory"),
     dev: bool = typer.Option(False, "--dev", help="Enable dev mode (.env)"),
-    output: Optional[Path] = typer.Option(
+    output: Path | None = typer.Option(
         None, "--output", "-o", help="Override directory to store exec logs"
     ),
     # verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
 ):
     """Execute an arbitrary command and cache its log."""
+    # 延迟导入：--help / version 等不需要执行器
+    from fix_compile.executor import ExecutionError, Executor
+    from fix_compile.utils.io import cmd2hash, save_exec_output
+
     config_service.load_config(dev_mode=dev)
     dir_config = config_service.config.dir_configs
 
     executor = Executor()
+    cwd = cwd or Path.cwd()
 
     try:
-        result = executor.execute(cmd, cwd=str(cwd) if cwd else None, stream=True)
-
         if output is None:
-            output = dir_config.cache_dir / cmd2hash(cmd, cwd or Path.cwd())
-        save_exec_output(result, output)
+            output = dir_config.cache_dir / cmd2hash(cmd, cwd)
+        result = executor.execute(cmd, cwd=str(cwd), stream=True, log_dir=output)
+        save_exec_output(result, output, metadata_only=True)
 
         if result.success:
             success("Command executed successfully")
@@ -86,24 +110,27 @@ def exec_command(
     help="Analyze logs from file, text, or command execution.",
 )
 def fix_command(
-    log_dir: Optional[Path] = typer.Option(
+    log_dir: Path | None = typer.Option(
         None,
         "--log-dir",
         "--dir",
         help="Path to log file OR directory (reads latest log)",
     ),
-    log_text: Optional[str] = typer.Option(
+    log_text: str | None = typer.Option(
         None, "--text", "-t", help="Raw log text provided directly"
     ),
     # 3. 命令改为 str，用户体验更好：--cmd "make build"
-    cmd: Optional[str] = typer.Option(
+    cmd: str | None = typer.Option(
         None,
         "--cmd",
         "-c",
         help="Command to execute to generate log (e.g. 'docker build .')",
     ),
     # 4. 辅助参数
-    cwd: Optional[Path] = typer.Option(None, help="Working directory for --cmd"),
+    cwd: Path | None = typer.Option(None, help="Working directory for --cmd"),
+    force: bool = typer.Option(
+        False, "--force", help="Force re-analysis (ignore cached suggestion)"
+    ),
     dev: bool = typer.Option(False, "--dev", help="Enable dev mode"),
 ):
     """Analyze a log using the LLM and output a single-round suggestion.
@@ -113,6 +140,21 @@ def fix_command(
     2) --log-dir if points to an existing directory (read metadata.json, stdout.txt or stderr.txt in it)
     3) --cmd: if provided, try reading --log-dir first; if missing, execute cmd, save output, and use it.
     """
+    # 延迟导入：LLM 相关依赖 (langchain/openai) 只在 fix 时加载
+    from fix_compile.executor import ExecutionError, Executor
+    from fix_compile.utils.io import (
+        cmd2hash,
+        is_cacheable_suggestion,
+        load_json,
+        load_suggestion,
+        read_logs,
+        save_exec_output,
+        save_suggestion,
+        split_cmd,
+        suggestion_key,
+        suggestion_settings,
+    )
+
     config_service.load_config(dev_mode=dev)
     dir_config = config_service.config.dir_configs
 
@@ -120,95 +162,129 @@ def fix_command(
 
     try:
         # Resolve error log string
-        error_log: Optional[str] = None
+        error_log: str | None = None
+
+        # --log-dir: a directory saved by save_exec_output, or a log file.
+        # One is_dir() stat: opening a directory raises IsADirectoryError on
+        # POSIX but PermissionError on Windows
+        log_file_text: str | None = None
+        log_dir_is_dir = bool(log_dir and not log_text and log_dir.is_dir())
+        if log_dir and not log_text and not log_dir_is_dir:
+            try:
+                log_file_text = log_dir.read_bytes().decode("utf-8", errors="replace")
+            except FileNotFoundError:
+                pass
 
         # 1) Direct text
         if log_text:
             error_log = log_text
         # 2) Read file or directory saved via save_exec_output (stdout.txt/stderr.txt)
-        elif log_dir and log_dir.exists():
-            if log_dir.is_file():
-                error_log = log_dir.read_text(encoding="utf-8")
-            else:
-                meta_path: Path = log_dir / "metadata.json"
-                if not meta_path.exists():
-                    error(
-                        "Log directory missing metadata.json. Provide a valid save_exec_output folder."
-                    )
-                    raise typer.Exit(1)
-
-                raw_meta = meta_path.read_text(encoding="utf-8")
-                cmd = json.loads(raw_meta).get("command", "")
-                if not cwd:
-                    cwd = Path(json.loads(raw_meta).get("cwd", ""))
-
-                stdout_path = log_dir / "stdout.txt"
-                stderr_path = log_dir / "stderr.txt"
-                stdout = (
-                    stdout_path.read_text(encoding="utf-8")
-                    if stdout_path.exists()
-                    else ""
-                )
-                stderr = (
-                    stderr_path.read_text(encoding="utf-8")
-                    if stderr_path.exists()
-                    else ""
+        elif log_file_text is not None:
+            error_log = log_file_text
+        elif log_dir_is_dir:
+            # One directory scan instead of an exists() per child file
+            with os.scandir(log_dir) as it:
+                entries = {e.name: Path(e.path) for e in it if e.is_file()}
+
+            meta_path = entries.get("metadata.json")
+            if meta_path is None:
+                error(
+                    "Log directory missing metadata.json. Provide a valid save_exec_output folder."
                 )
+                raise typer.Exit(1)
 
-                error_log = (
-                    f"cmd: {cmd} cwd: {cwd}\n\nSTDOUT:\n{stdout}\n\nSTDERR:\n{stderr}"
-                )
+            meta = load_json(meta_path)
+            cmd = meta.get("command", "")
+            if not cwd:
+                cwd = Path(meta.get("cwd", ""))
 
-                if not error_log.strip():
-                    error(
-                        "Log directory missing stdout.txt and stderr.txt. Provide a valid save_exec_output folder."
-                    )
-                    raise typer.Exit(1)
+            stdout, stderr = read_logs(
+                entries.get("stdout.txt"), entries.get("stderr.txt")
+            )
+
+            error_log = (
+                f"cmd: {cmd} cwd: {cwd}\n\nSTDOUT:\n{stdout}\n\nSTDERR:\n{stderr}"
+            )
+
+            if not error_log.strip():
+                error(
+                    "Log directory missing stdout.txt and stderr.txt. Provide a valid save_exec_output folder."
+                )
+                raise typer.Exit(1)
         # 3) Execute command
         elif cmd:
-            cmd = shlex.split(cmd)
-            result = executor.execute(cmd, cwd=str(cwd) if cwd else None, stream=True)
+            argv = split_cmd(cmd)
+            cwd = cwd or Path.cwd()
             # Save to output directory (either provided or derived)
             if not log_dir:
-                log_dir = dir_config.cache_dir / cmd2hash(cmd, cwd or Path.cwd())
-            save_exec_output(result, log_dir)
+                log_dir = dir_config.cache_dir / cmd2hash(argv, cwd)
+            result = executor.execute(argv, cwd=str(cwd), stream=True, log_dir=log_dir)
+            save_exec_output(result, log_dir, metadata_only=True)
+            # result.command is the shlex-joined argv; reuse it instead of re-joining
+            cmd = result.command
             error_log = (
-                f"cmd: {shlex.join(cmd)} cwd: {cwd or Path.cwd()}\n\n"
+                f"cmd: {cmd} cwd: {cwd}\n\n"
                 f"STDOUT:\n{result.stdout}\n\nSTDERR:\n{result.stderr}"
             )
 
         if not error_log:
             warning("error log is empty. Maybe only non zero exit code?")
 
-        # Perform analysis with current working directory
-        general_fixer = GeneralFixer()
-        suggestion = general_fixer.quick_analyze(
-            error_log=error_log, cwd=str(cwd or Path.cwd())
-        )
+        # Resolve the working directory once for the rest of the body; an
+        # absolute path keeps cache keys stable (shared with fix-batch)
+        cwd = (cwd or Path.cwd()).resolve()
 
-        # Show suggestion based on type
-        info(f"Reason: {suggestion.reason}\n")
-        info(f"Fix Type: {suggestion.fix_type.value}\n")
+        # Reuse a cached suggestion for identical inputs
+        key = suggestion_key(
+            cmd or "",
+            str(cwd),
+            error_log or "",
+            *suggestion_settings(config_service.config),
+        )
+        suggestion = None if force else load_suggestion(dir_config.cache_dir, key)
+        if suggestion is not None:
+            info("📦 Using cached suggestion (use --force to re-analyze)")
+        else:
+            # langchain/openai 只在缓存未命中、真正需要调用 LLM 时才导入
+            from fix_compile.workflows.general_fixer import GeneralFixer
+
+            # Perform analysis with current working directory
+            general_fixer = GeneralFixer()
+            suggestion = general_fixer.quick_analyze(error_log=error_log, cwd=str(cwd))
+            if is_cacheable_suggestion(suggestion):
+                save_suggestion(suggestion, dir_config.cache_dir, key)
+
+        # Show suggestion based on type; text lines are batched into one
+        # print per block, flushed before each syntax panel
+        parts = [
+            f"Reason: {suggestion.reason}\n",
+            f"Fix Type: {suggestion.fix_type.value}\n",
+        ]
 
         if suggestion.fix_type.value == "command":
+            info("\n".join(parts))
+            parts = []
             print_dockerfile(suggestion.command, title="Suggested Command")
             if suggestion.command_explanation:
-                info(f"Explanation: {suggestion.command_explanation}\n")
+                parts.append(f"Explanation: {suggestion.command_explanation}\n")
         elif suggestion.fix_type.value == "file":
-            info(f"File: {suggestion.file_path}\n")
+            parts.append(f"File: {suggestion.file_path}\n")
             if suggestion.file_explanation:
-                info(f"Explanation: {suggestion.file_explanation}\n")
+                parts.append(f"Explanation: {suggestion.file_explanation}\n")
+            info("\n".join(parts))
+            parts = []
             print_dockerfile(suggestion.new_content, title="Suggested File Content")
         elif suggestion.fix_type.value == "docker":
-            info(f"Dockerfile: {suggestion.dockerfile_path}\n")
+            parts.append(f"Dockerfile: {suggestion.dockerfile_path}\n")
+            info("\n".join(parts))
+            parts = []
             print_dockerfile(
                 suggestion.dockerfile_content, title="Suggested Dockerfile"
             )
 
-        info(
-            f"Changes: {suggestion.changes_summary}\n\n"
-            f"Confidence: {suggestion.confidence:.0%}"
-        )
+        parts.append(f"Changes: {suggestion.changes_summary}\n")
+        info("\n".join(parts))
+        ui.confidence(suggestion.confidence)
     except Exception as e:
         error(f"Analysis failed: {e}")
         raise typer.Exit(1)
@@ -217,19 +293,177 @@ def fix_command(
         raise typer.Exit(1)
 
 
+# -------------------------------
+# Command: fix-batch (concurrent single-round analysis)
+# -------------------------------
+def _read_batch_entry(line: str) -> tuple[dict, str]:
+    """
+    Parse one fix-batch manifest line and resolve its error log.
+
+    Args:
+        line: One JSONL line of the manifest
+
+    Returns:
+        (entry, error_log)
+
+    Raises:
+        TypeError: If the line is not a JSON object or cwd/output is not a
+            string
+        ValueError: If the line is not valid JSON, names no log, or the log
+            cannot be read or is empty
+    """
+    entry = json.loads(line)  # JSONDecodeError is a ValueError
+    if not isinstance(entry, dict):
+        raise TypeError("entry is not a JSON object")
+
+    if isinstance(entry.get("error_log"), str):
+        error_log = entry["error_log"]
+    elif isinstance(entry.get("log_file"), str) and entry["log_file"]:
+        try:
+            error_log = (
+                Path(entry["log_file"]).read_bytes().decode("utf-8", errors="replace")
+            )
+        except OSError as e:
+            raise ValueError(f"cannot read log_file: {e}") from e
+    else:
+        raise ValueError('entry needs an "error_log" or "log_file" string')
+    for field in ("cwd", "output"):
+        if entry.get(field) is not None and not isinstance(entry[field], str):
+            raise TypeError(f'"{field}" must be a string')
+
+    if not error_log.strip():
+        raise ValueError("error log is empty")
+    return entry, error_log
+
+
+@app.command(
+    name="fix-batch",
+    no_args_is_help=True,
+    help="Analyze many logs listed in a JSONL manifest with concurrent LLM requests.",
+)
+def fix_batch_command(
+    manifest: Path = typer.Argument(
+        ...,
+        help='JSONL file, one entry per line: {"log_file" | "error_log", "cwd"?, "output"?}',
+    ),
+    jobs: int = typer.Option(4, "--jobs", "-j", min=1, help="Concurrent LLM requests"),
+    force: bool = typer.Option(
+        False, "--force", help="Force re-analysis (ignore cached suggestions)"
+    ),
+    dev: bool = typer.Option(False, "--dev", help="Enable dev mode"),
+):
+    """Analyze every manifest entry and save or print one suggestion per entry.
+
+    Each entry provides the log as ``log_file`` (path) or ``error_log`` (text).
+    ``cwd`` defaults to the current directory. With ``output`` the suggestion is
+    written there as JSON, otherwise a one-line summary is printed.
+    """
+    from fix_compile.schema import GeneralAnalysisContext
+    from fix_compile.utils.io import (
+        is_cacheable_suggestion,
+        load_suggestion,
+        save_suggestion,
+        suggestion_key,
+        suggestion_settings,
+    )
+    from fix_compile.workflows.general_fixer import GeneralFixer
+
+    config_service.load_config(dev_mode=dev)
+    config = config_service.config
+    cache_dir = config.dir_configs.cache_dir
+
+    try:
+        lines = [
+            line
+            for line in manifest.read_text(encoding="utf-8").splitlines()
+            if line.strip()
+        ]
+    except OSError as e:
+        error(f"Failed to read manifest {manifest}: {e}")
+        raise typer.Exit(1)
+
+    # Resolve logs and serve cache hits; only misses go to the LLM batch.
+    # A bad entry is reported as failed without aborting the batch.
+    entries: list[dict] = [{}] * len(lines)
+    suggestions: list = [None] * len(lines)
+    keys: list[str] = [""] * len(lines)
+    pending: list[int] = []
+    contexts: list[GeneralAnalysisContext] = []
+    for i, line in enumerate(lines):
+        try:
+            entries[i], error_log = _read_batch_entry(line)
+        except (TypeError, ValueError) as e:
+            suggestions[i] = e
+            continue
+
+        cwd = Path(entries[i].get("cwd") or Path.cwd()).resolve()
+        # Same key construction as `fix --text`, so the two share cache entries
+        keys[i] = suggestion_key("", str(cwd), error_log, *suggestion_settings(config))
+        suggestions[i] = None if force else load_suggestion(cache_dir, keys[i])
+        if suggestions[i] is None:
+            pending.append(i)
+            contexts.append(
+                GeneralAnalysisContext(error_log=error_log, cwd=cwd.as_posix())
+            )
+
+    invalid = sum(isinstance(s, Exception) for s in suggestions)
+    cached = len(lines) - invalid - len(pending)
+    info(f"{cached} cached, {invalid} invalid, {len(pending)} to analyze")
+    if contexts:
+        results = GeneralFixer().analyze_batch(contexts, max_concurrency=jobs)
+        for i, result in zip(pending, results):
+            suggestions[i] = result
+            if not isinstance(result, Exception) and is_cacheable_suggestion(result):
+                save_suggestion(result, cache_dir, keys[i])
+
+    failed = 0
+    for i, (entry, suggestion) in enumerate(zip(entries, suggestions)):
+        label = entry.get("log_file") or f"entry {i + 1}"
+        if isinstance(suggestion, Exception):
+            failed += 1
+            error(f"{label}: failed: {suggestion}")
+            continue
+
+        output = entry.get("output")
+        if output:
+            output = Path(output)
+            try:
+                if not output.parent.is_dir():
+                    output.parent.mkdir(parents=True, exist_ok=True)
+                output.write_text(
+                    suggestion.model_dump_json(indent=2), encoding="utf-8"
+                )
+            except OSError as e:
+                failed += 1
+                error(f"{label}: cannot save suggestion: {e}")
+                continue
+            success(f"{label}: saved suggestion to {output}")
+        else:
+            info(
+                f"{label}: {suggestion.fix_type.value} fix, "
+                f"{suggestion.changes_summary} ({suggestion.confidence:.0%})"
+            )
+
+    if failed:
+        warning(f"{failed}/{len(lines)} entries failed")
+        raise typer.Exit(1)
+
+
 # -------------------------------
 # Version and main
 # -------------------------------
 @app.command()
 def version() -> None:
     """Show version information."""
-    from fix_compile import __name__, __version__
+    from fix_compile._version import __version__
 
-    console.print(f"{__name__} version {__version__}")
+    console.print(f"fix_compile version {__version__}")
 
 
 def main() -> None:
-    """Entry point for the CLI."""
+    """Run the Typer app (``version`` is answered earlier by cli.launcher)."""
+    _register_subapps(sys.argv)
+
     try:
         app()
     except KeyboardInterrupt:
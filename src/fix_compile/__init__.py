@@ -1,27 +1,43 @@
 """Fix Docker build and runtime errors using LLM."""
 
-import fix_compile.constants
+import importlib
 
-__version__ = fix_compile.constants.__version__
+from fix_compile._version import __version__
 
-from fix_compile.config import ConfigService
+# 懒加载公开 API (PEP 562)：`import fix_compile` 不再连带加载 workflows / langchain
+_LAZY: dict[str, tuple[str, str]] = {
+    "ConfigService": ("fix_compile.config", "ConfigService"),
+    "Executor": ("fix_compile.executor", "Executor"),
+    "CommandResult": ("fix_compile.schema", "CommandResult"),
+    "DockerBuildConfig": ("fix_compile.schema", "DockerBuildConfig"),
+    "DockerRunConfig": ("fix_compile.schema", "DockerRunConfig"),
+    "FixSuggestion": ("fix_compile.schema", "FixSuggestion"),
+    "GeneralAnalysisContext": ("fix_compile.schema", "GeneralAnalysisContext"),
+    "PromptBuilder": ("fix_compile.utils.prompt_builder", "PromptBuilder"),
+    "DockerFixer": ("fix_compile.workflows.docker_fixer", "DockerFixer"),
+    "GeneralFixer": ("fix_compile.workflows.general_fixer", "GeneralFixer"),
+    "setup_phoenix_tracing": ("fix_compile.utils.dev_tool", "setup_phoenix_tracing"),
+    "get_phoenix_status": ("fix_compile.utils.dev_tool", "get_phoenix_status"),
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY:
+        module_name, attr = _LAZY[name]
+        obj = getattr(importlib.import_module(module_name), attr)
+        globals()[name] = obj  # 缓存，后续访问不再经过 __getattr__
+        return obj
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_LAZY])
 
-from .executor import Executor
-from .schema import (
-    CommandResult,
-    DockerBuildConfig,
-    DockerRunConfig,
-    FixSuggestion,
-    GeneralAnalysisContext,
-)
-from .utils.prompt_builder import PromptBuilder
-from .workflows.docker_fixer import DockerFixer
-from .workflows.general_fixer import GeneralFixer
 
 __all__ = [
+    "__version__",
     "GeneralFixer",
     "Executor",
-    "config",
     "GeneralAnalysisContext",
     "FixSuggestion",
     "CommandResult",
@@ -31,14 +47,5 @@ __all__ = [
     "PromptBuilder",
     "setup_phoenix_tracing",
     "get_phoenix_status",
-    "set_config_value",
-    "get_config_value",
-    "delete_config_value",
-    "list_all_config",
-    "load_config_file",
-    "save_config_file",
-    "validate_config_key",
-    "get_config_file_path",
-    "get_config_dir_path",
     "ConfigService",
 ]
@@ -1,6 +1,6 @@
 """Entry point for fix-compile package."""
 
-from fix_compile.main import main
+from cli.launcher import main
 
 if __name__ == "__main__":
     main()
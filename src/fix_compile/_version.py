@@ -0,0 +1,3 @@
+"""Package version. Kept import-free so `fix-compile version` stays cheap."""
+
+__version__ = "0.2.0"
@@ -8,12 +8,13 @@ Priority:
 
 """
 
+import copy
+import functools
 import logging.config
+from collections import ChainMap
 from pathlib import Path
 
-import yaml
-from dotenv import load_dotenv
-from pydantic import BaseModel, Field, SecretStr
+from pydantic import BaseModel, ConfigDict, Field, SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 from fix_compile.constants import (
@@ -28,17 +29,20 @@ from fix_compile.constants import (
     ENV_FILENAME,
     LOG_FILENAME,
     PROJECT_NAME,
-    USER_CACHE_DIR,
-    USER_CONFIG_DIR,
-    USER_DATA_DIR,
-    USER_LOG_DIR,
-    USER_STATE_DIR,
+    log_path,
+    user_cache_dir,
+    user_config_dir,
+    user_data_dir,
+    user_log_dir,
+    user_state_dir,
 )
 from fix_compile.utils import ui
 
 
 def _load_dotenv(override: bool = False):
-    # Load environment variables from .env file
+    # Load environment variables from .env file (dev mode only, import on demand)
+    from dotenv import load_dotenv
+
     env_path = DEV_ROOT / ENV_FILENAME
     load_dotenv(
         dotenv_path=env_path,
@@ -46,6 +50,27 @@ def _load_dotenv(override: bool = False):
     )
 
 
+# config_file -> (st_mtime_ns, st_size, parsed data)，文件未变化时跳过 YAML 解析
+_yaml_cache: dict[Path, tuple[int, int, dict]] = {}
+
+
+def _read_yaml_config(config_file: Path) -> dict:
+    """Parse the YAML config file, reusing the last parse while (mtime, size) match."""
+    st = config_file.stat()
+    cached = _yaml_cache.get(config_file)
+    if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+        # 配置项均为标量，浅拷贝即可保证缓存不被调用方修改
+        return dict(cached[2])
+
+    import yaml  # 仅在需要解析配置文件时才导入
+
+    with config_file.open("r", encoding="utf-8") as f:
+        # libyaml 可用时使用 C 实现的 loader
+        data = yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader)) or {}
+    _yaml_cache[config_file] = (st.st_mtime_ns, st.st_size, data)
+    return dict(data)
+
+
 # 定义配置字典
 LOGGING_CONFIG = {
     "version": 1,
@@ -73,9 +98,7 @@ LOGGING_CONFIG = {
             "class": "logging.FileHandler",
             "level": "DEBUG",
             "formatter": "standard",
-            "filename": str(
-                USER_LOG_DIR / LOG_FILENAME
-            ),  # 这里建议用 platformdirs 动态获取路径
+            "filename": None,  # setup_logging 时由 platformdirs 动态填入
             "encoding": "utf-8",
         },
     },
@@ -102,35 +125,74 @@ LOGGING_CONFIG = {
 }
 
 
+# dictConfig 只在首次 setup_logging 时执行
+_logging_initialized = False
+
+
 def setup_logging(log_level: str, enabled_console: bool = False):
     """Setup logging configuration. Default log saved as file only. If enabled_console is True, also log to console."""
-    if not USER_LOG_DIR.exists():
-        ui.error(
-            f"Log directory {USER_LOG_DIR} does not exist. Likely config not loaded."
+    log_dir = user_log_dir()
+    if not log_dir.exists():
+        ui.error(f"Log directory {log_dir} does not exist. Likely config not loaded.")
+        raise FileNotFoundError(f"Log directory {log_dir} does not exist.")
+
+    global _logging_initialized
+
+    project_logger = logging.getLogger(PROJECT_NAME)
+    if _logging_initialized:
+        # dictConfig 会清空所有 logger 的缓存；重复调用只调整级别与 console handler
+        project_logger.setLevel(log_level.upper())
+        console_handler = next(
+            (h for h in logging.getLogger().handlers if h.name == "console"), None
         )
-        raise FileNotFoundError(f"Log directory {USER_LOG_DIR} does not exist.")
-
+        if console_handler is not None:
+            if enabled_console:
+                project_logger.addHandler(console_handler)  # 已存在时为 no-op
+            else:
+                project_logger.removeHandler(console_handler)
+        return
+
+    # 在副本上修改，LOGGING_CONFIG 保持不变
+    logging_config = copy.deepcopy(LOGGING_CONFIG)
     if not enabled_console:
-        LOGGING_CONFIG["loggers"][PROJECT_NAME]["handlers"].remove("console")
+        logging_config["loggers"][PROJECT_NAME]["handlers"].remove("console")
 
-    LOGGING_CONFIG["loggers"][PROJECT_NAME]["level"] = log_level.upper()
-    logging.config.dictConfig(LOGGING_CONFIG)
+    logging_config["handlers"]["file"]["filename"] = str(log_path())
+    logging_config["loggers"][PROJECT_NAME]["level"] = log_level.upper()
+    logging.config.dictConfig(logging_config)
+    _logging_initialized = True
     ui.info(f"Logging initialized with level {log_level}")
-    ui.info(f"Log file: {USER_LOG_DIR / LOG_FILENAME}")
+    ui.info(f"Log file: {log_path()}")
 
 
 class DirConfigs(BaseModel):
     """Directory configurations."""
 
-    config_dir: Path = USER_CONFIG_DIR
-    cache_dir: Path = USER_CACHE_DIR
-    log_dir: Path = USER_LOG_DIR
-    data_dir: Path = USER_DATA_DIR
-    state_dir: Path = USER_STATE_DIR
+    # 冻结后可安全共享同一个默认实例
+    model_config = ConfigDict(frozen=True)
+
+    # 平台目录在首次实例化时才计算
+    config_dir: Path = Field(default_factory=user_config_dir)
+    cache_dir: Path = Field(default_factory=user_cache_dir)
+    log_dir: Path = Field(default_factory=user_log_dir)
+    data_dir: Path = Field(default_factory=user_data_dir)
+    state_dir: Path = Field(default_factory=user_state_dir)
+
+    cache_file: Path = Field(default_factory=lambda d: d["cache_dir"] / CACHE_FILENAME)
+    log_file: Path = Field(default_factory=lambda d: d["log_dir"] / LOG_FILENAME)
+    config_file: Path = Field(
+        default_factory=lambda d: d["config_dir"] / CONFIG_FILENAME
+    )
+
+
+@functools.cache
+def _default_dir_configs() -> DirConfigs:
+    """The shared default DirConfigs, built on first use."""
+    return DirConfigs()
 
-    cache_file: Path = cache_dir / CACHE_FILENAME
-    log_file: Path = log_dir / LOG_FILENAME
-    config_file: Path = config_dir / CONFIG_FILENAME
+
+# 已确保目录存在的 DirConfigs（冻结模型可哈希）
+_ensured_dir_configs: set[DirConfigs] = set()
 
 
 class Configs(BaseSettings):
@@ -163,13 +225,19 @@ class Configs(BaseSettings):
         default=DEFAULT_TIMEOUT, gt=0, description="Timeout in seconds"
     )
 
+    # Docker 构建配置（环境变量 DOCKER_BUILDKIT=1 同样生效）
+    DOCKER_BUILDKIT: bool = Field(
+        default=False,
+        description="Build with BuildKit (needs buildx); default is the legacy builder",
+    )
+
     # 自定义提示词配置
     CUSTOM_PROMPT: str = Field(
         default="",
         description="User custom prompt to append to system prompt (e.g., proxy settings, environment requirements)",
     )
 
-    dir_configs: DirConfigs = Field(default_factory=DirConfigs)
+    dir_configs: DirConfigs = Field(default_factory=_default_dir_configs)
 
     # 关闭 Pydantic Settings 的 dotenv 功能，已由 dotenv 加载到 os.environ
     # （默认不区分大小写）
@@ -191,19 +259,39 @@ class ConfigService:
         # 懒加载：实例化时才去读取环境变量
         self._settings: Configs = None
         self._dir_settings: DirConfigs = None
+        # (config_file, (mtime_ns, size), dev_mode) -> Configs，避免重复解析与校验
+        self._cache: dict[tuple, Configs] = {}
 
-    def _ensure_dirs(self):
-        """确保所有运行时需要的目录都存在"""
-        for attr in self._dir_settings.model_dump():
-            if attr.endswith("_file"):
-                continue
+    @staticmethod
+    def _cache_key(config_file: Path, dev_mode: bool) -> tuple:
+        """Build the cache key for a loaded config (file missing -> stat None)."""
+        try:
+            st = config_file.stat()
+            file_stat = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            file_stat = None
+        return (config_file, file_stat, dev_mode)
 
-            path = getattr(self._dir_settings, attr)
-            if isinstance(path, Path) and not path.exists():
+    def _ensure_dirs(self):
+        """确保所有运行时需要的目录都存在（每个 DirConfigs 每进程只检查一次）"""
+        dir_settings = self._dir_settings
+        if dir_settings in _ensured_dir_configs:
+            return
+
+        for path in (
+            dir_settings.config_dir,
+            dir_settings.cache_dir,
+            dir_settings.log_dir,
+            dir_settings.data_dir,
+            dir_settings.state_dir,
+            # only log file's file name contains path components (YYYY/MM/DD)
+            dir_settings.log_file.parent,
+        ):
+            # 已存在时只需一次 stat；mkdir(exist_ok=True) 则是 mkdir + stat
+            if not path.is_dir():
                 path.mkdir(parents=True, exist_ok=True)
 
-        # only log file's file name contains path components
-        self._dir_settings.log_file.parent.mkdir(parents=True, exist_ok=True)
+        _ensured_dir_configs.add(dir_settings)
 
     def load_config(self, *, dev_mode: bool = False, **kwargs):
         """
@@ -213,44 +301,52 @@ class ConfigService:
         if dev_mode:
             _load_dotenv(override=False)
 
+        # 命中缓存：配置文件未变化时直接复用已校验的 Configs
+        config_file = (self._dir_settings or _default_dir_configs()).config_file
+        cache_key = self._cache_key(config_file, dev_mode)
+        if not kwargs and cache_key in self._cache:
+            self._settings = self._cache[cache_key]
+            self._dir_settings = self._settings.dir_configs
+            ui.debug(f"Using cached config for {config_file}")
+            return
+
         # 读取配置
-        self._settings = Configs()
-        self._dir_settings = self._settings.dir_configs
+        self._dir_settings = self._dir_settings or _default_dir_configs()
         self._ensure_dirs()
 
-        config_file = self._dir_settings.config_file
+        profile_values: dict = {}
         if config_file.exists():
             ui.info(f"Loading config file from {config_file}")
             try:
-                with config_file.open("r", encoding="utf-8") as f:
-                    data = yaml.safe_load(f)
-                    _profile_settings = Configs.model_validate(data)
-                    kv_pairs = _profile_settings.model_dump(
-                        exclude={"dir_configs"}
-                    ).items()
-                    ui.debug(f"Config file key-values: {kv_pairs}")
-
-                    for key, value in kv_pairs:
-                        setattr(self._settings, key, value)
-                        ui.debug(f"Loaded config {key} from file")
-
+                profile_values = _read_yaml_config(config_file)
+                ui.debug(f"Config file key-values: {profile_values.items()}")
             except Exception as e:
                 ui.error(f"Failed to load config file {config_file}: {e}")
                 raise
 
         # 覆盖配置
+        overrides = {
+            key.upper(): value
+            for key, value in kwargs.items()
+            if key.upper() in Configs.model_fields
+        }
+        if overrides:
+            ui.debug(f"Overridden config {sorted(overrides)} from kwargs")
+
+        # 一次构造、一次校验：init 参数优先于环境变量，ChainMap 按
+        # cli settings > config profile 的顺序查找，无需逐层复制合并
         try:
-            for key, value in kwargs.items():
-                key = key.upper()
-                if hasattr(self._settings, key):
-                    setattr(self._settings, key, value)
-                    ui.debug(f"Overridden config {key} from kwargs")
+            self._settings = Configs(**ChainMap(overrides, profile_values))
         except Exception as e:
-            ui.error(f"Failed to override config with kwargs: {e}")
+            ui.error(f"Invalid configuration: {e}")
             raise
+        self._dir_settings = self._settings.dir_configs
 
         setup_logging(self._settings.LOG_LEVEL)
 
+        if not kwargs:
+            self._cache[cache_key] = self._settings
+
     @property
     def config(self) -> Configs:
         """对外暴露静态配置"""
@@ -268,9 +364,18 @@ class ConfigService:
             "OPENAI_API_KEY"
         ].get_secret_value()  # decrypt for saving
 
+        import yaml
+
         config_path = self._dir_settings.config_file
         with config_path.open("w", encoding="utf-8") as f:
-            yaml.dump(dump_settings, f)
+            yaml.dump(
+                dump_settings,
+                f,
+                Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper),
+            )
+
+        # 配置文件已变化，缓存失效
+        self._cache.clear()
 
 
 # ---------------------------------------------------------
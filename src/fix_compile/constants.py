@@ -1,21 +1,26 @@
 """
 Global constants for fix-compile.
-This module should NOT import any other internal modules to avoid circular dependencies.
+This module should NOT import any other internal modules to avoid circular dependencies
+(fix_compile._version is a leaf module and the only exception).
 """
 
+import functools
 from datetime import datetime
 from enum import IntEnum, StrEnum  # Python 3.11+ use StrEnum
 from pathlib import Path
-from typing import Final
+from typing import TYPE_CHECKING, Final
 
-from platformdirs import PlatformDirs
+from fix_compile._version import __version__ as _VERSION
+
+if TYPE_CHECKING:
+    from platformdirs import PlatformDirs
 
 # ---------------------------------------------------------
 # 1. 基础元数据 (Basic Metadata)
 # 使用 Final 标记，IDE 和 MyPy 会检查是否有代码试图修改它
 # ---------------------------------------------------------
 PROJECT_NAME: Final[str] = "fix-compile"
-__version__: Final[str] = "0.2.0"
+__version__: Final[str] = _VERSION
 
 # ---------------------------------------------------------
 # 2. 默认值与硬编码配置 (Defaults)
@@ -36,24 +41,73 @@ DEFAULT_MAX_TOKENS: Final[int] = 32768
 PKG_ROOT = Path(__file__).resolve().parent
 DEV_ROOT: Final[Path] = PKG_ROOT.parent.parent
 
-PLATFORM_DIRS: Final[PlatformDirs] = PlatformDirs(
-    appname=PROJECT_NAME, appauthor=PROJECT_NAME, version=__version__
-)
 
-USER_DATA_DIR: Final[Path] = Path(PLATFORM_DIRS.user_data_dir)
-USER_CONFIG_DIR: Final[Path] = Path(PLATFORM_DIRS.user_config_dir)
-USER_CACHE_DIR: Final[Path] = Path(PLATFORM_DIRS.user_cache_dir)
-USER_LOG_DIR: Final[Path] = Path(PLATFORM_DIRS.user_log_dir)
-USER_STATE_DIR: Final[Path] = Path(PLATFORM_DIRS.user_state_dir)
+# 平台目录按需计算 (platformdirs 只在首次访问时导入)；
+# USER_*_DIR / PLATFORM_DIRS 仍可通过模块级 __getattr__ 访问
+@functools.cache
+def platform_dirs() -> "PlatformDirs":
+    from platformdirs import PlatformDirs
+
+    return PlatformDirs(
+        appname=PROJECT_NAME, appauthor=PROJECT_NAME, version=__version__
+    )
+
+
+@functools.cache
+def user_data_dir() -> Path:
+    return Path(platform_dirs().user_data_dir)
+
+
+@functools.cache
+def user_config_dir() -> Path:
+    return Path(platform_dirs().user_config_dir)
+
+
+@functools.cache
+def user_cache_dir() -> Path:
+    return Path(platform_dirs().user_cache_dir)
+
+
+@functools.cache
+def user_log_dir() -> Path:
+    return Path(platform_dirs().user_log_dir)
+
+
+@functools.cache
+def user_state_dir() -> Path:
+    return Path(platform_dirs().user_state_dir)
+
+
+_LAZY_PATHS = {
+    "PLATFORM_DIRS": platform_dirs,
+    "USER_DATA_DIR": user_data_dir,
+    "USER_CONFIG_DIR": user_config_dir,
+    "USER_CACHE_DIR": user_cache_dir,
+    "USER_LOG_DIR": user_log_dir,
+    "USER_STATE_DIR": user_state_dir,
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_PATHS:
+        return _LAZY_PATHS[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # 固定的文件名
 ENV_FILENAME: Final[str] = ".env"
 CONFIG_FILENAME: Final[str] = "config.yaml"
 CACHE_FILENAME: Final[str] = "cache.json"
+SUGGESTION_CACHE_DIRNAME: Final[str] = "suggestions"
 LOG_FILENAME: Final[str] = datetime.now().strftime("%Y/%m/%d/%H-%M.log")
 
 
+@functools.cache
+def log_path() -> Path:
+    """This process's log file (LOG_FILENAME is resolved once at import)."""
+    return user_log_dir() / LOG_FILENAME
+
+
 # ---------------------------------------------------------
 # 4. 枚举值 (Enums) - 强烈推荐用于 CLI 状态码
 # ---------------------------------------------------------
@@ -1,10 +1,15 @@
 """Executor module - The Hand (subprocess and file operations)."""
 
+import contextlib
+import os
+import selectors
 import shlex
+import shutil
 import subprocess
 import sys
+import time
+from itertools import chain
 from pathlib import Path
-from typing import Optional
 
 from fix_compile.schema import (
     CommandResult,
@@ -14,6 +19,12 @@ from fix_compile.schema import (
 )
 from fix_compile.utils import ui
 
+# 流式读取子进程输出时每次 os.read 的最大字节数
+_READ_CHUNK_SIZE = 64 * 1024
+# 流式显示的批量刷新阈值：累计字节数或距上次刷新的秒数
+_FLUSH_BYTES = 4096
+_FLUSH_INTERVAL = 0.05
+
 
 class ExecutionError(Exception):
     """Raised when command execution fails critically."""
@@ -39,7 +50,12 @@ class Executor:
         self.verbose = verbose
 
     def execute(
-        self, cmd: list[str], cwd: Optional[str] = None, stream: bool = True
+        self,
+        cmd: list[str],
+        cwd: str | None = None,
+        stream: bool = True,
+        log_dir: Path | None = None,
+        env: dict[str, str] | None = None,
     ) -> CommandResult:
         """
         Execute a shell command and capture output.
@@ -48,6 +64,8 @@ class Executor:
             cmd: Command to execute as a list
             cwd: Working directory for the command
             stream: Whether to stream output to stdout in real-time
+            log_dir: If set, write stdout.txt/stderr.txt into it as output arrives
+            env: Environment for the command (defaults to the current one)
 
         Returns:
             CommandResult with exit code and captured output
@@ -58,53 +76,46 @@ class Executor:
         ui.info(f"Executing command: [bold]{cmd_str}[/bold]")
 
         try:
-            if stream:
-                # Stream mode: show output in real-time, capture stderr
-                process = subprocess.Popen(
-                    cmd,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    cwd=cwd,
-                    text=True,
-                    bufsize=1,
-                    universal_newlines=True,
-                )
-
-                stdout_lines = []
-                stderr_lines = []
-
-                # Read stdout and stderr
-                while True:
-                    stdout_line = process.stdout.readline()
-                    if stdout_line:
-                        stdout_lines.append(stdout_line)
-                        ui.info(stdout_line.rstrip())
-                        sys.stdout.flush()
-
-                    # Check if process is done
-                    if process.poll() is not None:
-                        break
-
-                # Capture remaining stderr
-                stderr_output = process.stderr.read()
-                if stderr_output:
-                    stderr_lines.append(stderr_output)
-
-                exit_code = process.wait()
-                stdout = "".join(stdout_lines)
-                stderr = "".join(stderr_lines)
-
-            else:
-                # Silent mode: just capture output
-                result = subprocess.run(
-                    cmd,
-                    cwd=cwd,
-                    capture_output=True,
-                    text=True,
-                )
-                exit_code = result.returncode
-                stdout = result.stdout
-                stderr = result.stderr
+            with contextlib.ExitStack() as stack:
+                f_out = f_err = None
+                if log_dir is not None:
+                    log_dir.mkdir(parents=True, exist_ok=True)
+                    # 原始字节直接落盘，不做逐块解码
+                    f_out = stack.enter_context(open(log_dir / "stdout.txt", "wb"))
+                    f_err = stack.enter_context(open(log_dir / "stderr.txt", "wb"))
+
+                if stream:
+                    # Stream mode: show stdout in real-time, capture both pipes
+                    process = subprocess.Popen(
+                        cmd,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.PIPE,
+                        cwd=cwd,
+                        env=env,
+                        bufsize=0,
+                    )
+                    stdout_bytes, stderr_bytes = self._stream_output(
+                        process, f_out, f_err
+                    )
+                    exit_code = process.wait()
+                    stdout = stdout_bytes.decode("utf-8", errors="replace")
+                    stderr = stderr_bytes.decode("utf-8", errors="replace")
+
+                else:
+                    # Silent mode: just capture output
+                    result = subprocess.run(
+                        cmd,
+                        cwd=cwd,
+                        env=env,
+                        capture_output=True,
+                        text=True,
+                    )
+                    exit_code = result.returncode
+                    stdout = result.stdout
+                    stderr = result.stderr
+                    if f_out:
+                        f_out.write(stdout.encode("utf-8"))
+                        f_err.write(stderr.encode("utf-8"))
 
             return CommandResult(
                 exit_code=exit_code,
@@ -120,6 +131,78 @@ class Executor:
         except Exception as e:
             raise ExecutionError(f"Failed to execute command: {e}") from e
 
+    @staticmethod
+    def _stream_output(
+        process: subprocess.Popen, f_out=None, f_err=None
+    ) -> tuple[bytes, bytes]:
+        """
+        Drain stdout and stderr of a running process concurrently.
+
+        Both pipes are read in 64 KiB chunks with os.read as soon as select
+        reports data, so a chatty stderr can no longer fill its pipe and block
+        the child while we wait on stdout. Complete stdout lines are batched
+        and shown with one ui.info call once _FLUSH_BYTES have accumulated or
+        _FLUSH_INTERVAL has passed; raw chunks go to f_out/f_err.
+
+        Returns:
+            (stdout, stderr) as raw bytes
+        """
+        if sys.platform == "win32":
+            # select() 不支持 Windows 管道，退化为一次性读取
+            stdout, stderr = process.communicate()
+            if stdout:
+                ui.info(stdout.decode("utf-8", errors="replace").rstrip())
+            for f, data in ((f_out, stdout), (f_err, stderr)):
+                if f:
+                    f.write(data)
+            return stdout, stderr
+
+        stdout_chunks: list[bytes] = []
+        stderr_chunks: list[bytes] = []
+        pending = bytearray()  # stdout 中尚未显示的内容
+        last_flush = time.monotonic()
+
+        with selectors.DefaultSelector() as selector:
+            selector.register(process.stdout, selectors.EVENT_READ, "stdout")
+            selector.register(process.stderr, selectors.EVENT_READ, "stderr")
+
+            while selector.get_map():
+                # 带超时的 select：输出停顿时也能按时刷新已缓冲的行
+                for key, _ in selector.select(timeout=_FLUSH_INTERVAL):
+                    chunk = os.read(key.fd, _READ_CHUNK_SIZE)
+                    if not chunk:  # EOF
+                        selector.unregister(key.fileobj)
+                        continue
+
+                    if key.data == "stderr":
+                        stderr_chunks.append(chunk)
+                        if f_err:
+                            f_err.write(chunk)
+                        continue
+
+                    stdout_chunks.append(chunk)
+                    if f_out:
+                        f_out.write(chunk)
+                    pending += chunk
+
+                now = time.monotonic()
+                if pending and (
+                    len(pending) >= _FLUSH_BYTES or now - last_flush >= _FLUSH_INTERVAL
+                ):
+                    # 只在换行处解码，避免切断多字节 UTF-8 字符
+                    end = pending.rfind(b"\n")
+                    if end >= 0:
+                        ui.info(pending[:end].decode("utf-8", errors="replace"))
+                        del pending[: end + 1]
+                        last_flush = now
+
+        if pending:
+            ui.info(pending.decode("utf-8", errors="replace"))
+
+        process.stdout.close()
+        process.stderr.close()
+        return b"".join(stdout_chunks), b"".join(stderr_chunks)
+
     def docker_build(self, config: DockerBuildConfig) -> CommandResult:
         """
         Execute docker build command.
@@ -130,23 +213,55 @@ class Executor:
         Returns:
             CommandResult with build output
         """
-        cmd = ["docker", "build"]
+        cmd = ["docker", "build", *self.docker_build_args(config), config.context]
 
-        if config.tag:
-            cmd.extend(["-t", config.tag])
+        return self.execute(cmd, stream=True, env=self.docker_build_env(config))
 
-        if config.no_cache:
-            cmd.append("--no-cache")
+    @staticmethod
+    def docker_build_args(config: DockerBuildConfig) -> list[str]:
+        """
+        Option arguments of docker build (without the build context).
 
-        if config.dockerfile != "Dockerfile":
-            cmd.extend(["-f", config.dockerfile])
+        Shared with the `docker build` CLI command, which appends the user's
+        extra arguments and context itself.
 
-        for key, value in config.build_args.items():
-            cmd.extend(["--build-arg", f"{key}={value}"])
+        Args:
+            config: Docker build configuration
 
-        cmd.append(config.context)
+        Returns:
+            List of docker build options
+        """
+        # 一次性构造完整参数列表
+        return [
+            *(("-t", config.tag) if config.tag else ()),
+            *(("--no-cache",) if config.no_cache else ()),
+            *(("-f", config.dockerfile) if config.dockerfile != "Dockerfile" else ()),
+            *chain.from_iterable(
+                ("--build-arg", f"{key}={value}")
+                for key, value in config.build_args.items()
+            ),
+            *chain.from_iterable(("--cache-from", src) for src in config.cache_from),
+            *(("--cache-to", config.cache_to) if config.cache_to else ()),
+        ]
+
+    @staticmethod
+    def docker_build_env(config: DockerBuildConfig) -> dict[str, str]:
+        """
+        Environment for a docker build: BuildKit or the legacy builder.
 
-        return self.execute(cmd, stream=True)
+        BuildKit builds independent multi-stage targets in parallel; plain
+        progress keeps its log readable for analysis.
+
+        Args:
+            config: Docker build configuration
+
+        Returns:
+            Copy of os.environ with DOCKER_BUILDKIT (and BUILDKIT_PROGRESS) set
+        """
+        env = {**os.environ, "DOCKER_BUILDKIT": "1" if config.buildkit else "0"}
+        if config.buildkit:
+            env["BUILDKIT_PROGRESS"] = "plain"
+        return env
 
     def docker_run(self, config: DockerRunConfig) -> CommandResult:
         """
@@ -158,20 +273,18 @@ class Executor:
         Returns:
             CommandResult with run output
         """
-        cmd = ["docker", "run"]
-
-        if config.remove:
-            cmd.append("--rm")
-
-        if config.detach:
-            cmd.append("-d")
-
-        cmd.extend(config.args)
-        cmd.append(config.image)
+        cmd = [
+            "docker",
+            "run",
+            *(("--rm",) if config.remove else ()),
+            *(("-d",) if config.detach else ()),
+            *config.args,
+            config.image,
+        ]
 
         return self.execute(cmd, stream=True)
 
-    def read_file(self, file_path: str) -> str:
+    def read_file(self, file_path: str | Path) -> str:
         """
         Read file content.
 
@@ -185,14 +298,14 @@ class Executor:
             ExecutionError: If file cannot be read
         """
         try:
-            path = Path(file_path)
+            path = file_path if isinstance(file_path, Path) else Path(file_path)
             return path.read_text(encoding="utf-8")
         except FileNotFoundError:
             raise ExecutionError(f"File not found: {file_path}")
         except Exception as e:
             raise ExecutionError(f"Failed to read {file_path}: {e}")
 
-    def write_file(self, file_path: str, content: str) -> None:
+    def write_file(self, file_path: str | Path, content: str) -> None:
         """
         Write content to file.
 
@@ -204,8 +317,10 @@ class Executor:
             ExecutionError: If file cannot be written
         """
         try:
-            path = Path(file_path)
-            path.parent.mkdir(parents=True, exist_ok=True)
+            path = file_path if isinstance(file_path, Path) else Path(file_path)
+            # mkdir(exist_ok=True) costs mkdir+stat when the dir exists
+            if not path.parent.is_dir():
+                path.parent.mkdir(parents=True, exist_ok=True)
             path.write_text(content, encoding="utf-8")
 
             if self.verbose:
@@ -227,17 +342,34 @@ class Executor:
         ui.info(f"\n[yellow]Applying fix to {fix.file_path}...[/yellow]")
         ui.info(f"[dim]{fix.changes_summary}[/dim]")
 
+        # 目标与备份路径只构造一次，后续直接传 Path
+        target = Path(fix.file_path)
+        backup_path = target.with_name(f"{target.name}.backup")
+
+        # No-op fix: skip backup + write when the file already has this content
+        new_bytes = fix.new_content.encode("utf-8")
+        try:
+            # 大小不同即可判定有变化，无需读取原文件
+            if target.stat().st_size == len(new_bytes) and (
+                target.read_bytes() == new_bytes
+            ):
+                ui.info("[dim]File already up to date, skipping no-op fix[/dim]")
+                return
+        except OSError:
+            pass
+
         # Create backup
-        backup_path = f"{fix.file_path}.backup"
         try:
-            original_content = self.read_file(fix.file_path)
-            self.write_file(backup_path, original_content)
+            # 字节级复制（Linux 上走 sendfile），备份无需解码再编码
+            shutil.copyfile(target, backup_path)
             ui.info(f"[dim]Backup created: {backup_path}[/dim]")
-        except ExecutionError:
+            if self.verbose:
+                ui.debug(f"Copied {fix.file_path} -> {backup_path}")
+        except OSError:
             ui.info("[yellow]Warning: Could not create backup[/yellow]")
 
         # Apply fix
-        self.write_file(fix.file_path, fix.new_content)
+        self.write_file(target, fix.new_content)
         ui.info("[green]✓ Fix applied successfully[/green]\n")
 
     def file_exists(self, file_path: str) -> bool:
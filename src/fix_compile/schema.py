@@ -207,6 +207,18 @@ class DockerBuildConfig(BaseModel):
         default_factory=dict, description="Build arguments"
     )
     no_cache: bool = Field(default=False, description="Don't use cache")
+    buildkit: bool = Field(
+        default=False,
+        description="Build with BuildKit (independent stages build in parallel)",
+    )
+    cache_from: list[str] = Field(
+        default_factory=list,
+        description="External cache sources, e.g. 'type=local,src=/path' (BuildKit)",
+    )
+    cache_to: str | None = Field(
+        default=None,
+        description="Cache export target, e.g. 'type=local,dest=/path,mode=max'",
+    )
 
 
 class DockerRunConfig(BaseModel):
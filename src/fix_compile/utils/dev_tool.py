@@ -1,13 +1,15 @@
 """Phoenix observability and tracing setup for debugging."""
 
+import functools
 import os
 from typing import Optional
 
-from phoenix.otel import register
-
 from fix_compile.constants import PROJECT_NAME
 from fix_compile.utils import ui
 
+# 追踪默认关闭：只有设置了该环境变量才会导入并注册 Phoenix
+TRACE_ENV_VAR = "FIX_COMPILE_TRACE"
+
 
 def setup_phoenix_tracing(
     project_name: str = PROJECT_NAME,
@@ -28,6 +30,9 @@ def setup_phoenix_tracing(
                  If not provided, uses PHOENIX_ENDPOINT env var or defaults to localhost:6006
     """
     try:
+        # phoenix 导入很重，只在真正启用追踪时加载
+        from phoenix.otel import register
+
         register(
             project_name=project_name,
             endpoint=endpoint,
@@ -38,6 +43,20 @@ def setup_phoenix_tracing(
         ui.warning(f"Failed to initialize Phoenix: {e}")
 
 
+@functools.cache
+def setup_tracing_from_env() -> bool:
+    """
+    Setup Phoenix tracing once per process if FIX_COMPILE_TRACE is set.
+
+    Returns:
+        Whether tracing was requested
+    """
+    if not os.getenv(TRACE_ENV_VAR):
+        return False
+    setup_phoenix_tracing()
+    return True
+
+
 def get_phoenix_status() -> dict:
     """
     Get the current Phoenix tracing status.
@@ -1,26 +1,52 @@
+import functools
 import hashlib
 import json
 import shlex
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
-from fix_compile.schema import CommandResult
+try:
+    import orjson  # 可选加速依赖
+except ImportError:
+    orjson = None
+
+from fix_compile.constants import SUGGESTION_CACHE_DIRNAME
+from fix_compile.schema import CommandResult, FixSuggestion
 from fix_compile.utils import ui
 
+if TYPE_CHECKING:
+    from fix_compile.config import Configs
+
 # ---------------------------------------------------------
 # 3. Helper / IO Functions
 # ---------------------------------------------------------
 
+# read_logs 并发读取的阈值
+_PARALLEL_READ_BYTES = 256 * 1024
+
 
 def format_json(data: Dict[str, Any]) -> str:
-    """Format dictionary as pretty JSON string."""
+    """Format dictionary as pretty JSON string (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(
+            data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        ).decode("utf-8")
     return json.dumps(data, indent=2, ensure_ascii=False)
 
 
+def load_json(file_path: Path) -> Any:
+    """Parse a JSON file from its raw bytes (orjson when available)."""
+    data = file_path.read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 def load_file(file_path: Path) -> str:
     """Load file content with error handling."""
     try:
-        content = file_path.read_text(encoding="utf-8")
+        content = file_path.read_bytes().decode("utf-8")
         ui.debug(f"Loaded file: {file_path}")
         return content
     except FileNotFoundError:
@@ -33,6 +59,53 @@ def load_file(file_path: Path) -> str:
         raise
 
 
+def read_log(file_path: Path) -> str:
+    """Read a log file in one bytes read. Missing file yields ""; bad UTF-8 is replaced."""
+    try:
+        return file_path.read_bytes().decode("utf-8", errors="replace")
+    except FileNotFoundError:
+        return ""
+
+
+def split_cmd(cmd: str) -> list[str]:
+    """Split a command string into argv. Plain commands skip the shlex lexer."""
+    if '"' in cmd or "'" in cmd or "\\" in cmd:
+        return shlex.split(cmd)
+    return cmd.split()
+
+
+@functools.lru_cache(maxsize=256)
+def _cmd_hash(cmd: str, cwd: str) -> str:
+    # Same digest as hashing f"{cmd}|{cwd}", keeps existing log dirs valid
+    h = hashlib.sha256(cmd.encode("utf-8"))
+    h.update(b"|")
+    h.update(cwd.encode("utf-8"))
+    return h.hexdigest()[:8]
+
+
+def read_logs(*file_paths: Path | None) -> list[str]:
+    """Read several log files with read_log (None yields "").
+
+    Above _PARALLEL_READ_BYTES in total the reads run in threads: file I/O
+    releases the GIL, so they overlap. Smaller logs are read sequentially
+    since the pool setup would cost more than it saves.
+    """
+
+    def _read(file_path: Path | None) -> str:
+        return read_log(file_path) if file_path is not None else ""
+
+    try:
+        total = sum(p.stat().st_size for p in file_paths if p is not None)
+    except OSError:
+        total = 0
+
+    if len(file_paths) < 2 or total < _PARALLEL_READ_BYTES:
+        return [_read(p) for p in file_paths]
+
+    with ThreadPoolExecutor(max_workers=len(file_paths)) as pool:
+        return list(pool.map(_read, file_paths))
+
+
 def cmd2hash(cmd: list[str] | str, cwd: Path | str) -> str:
     """Generate a SHA256 hash for a command and cwd. Used to locate log dirs."""
     if isinstance(cmd, list):
@@ -40,16 +113,71 @@ def cmd2hash(cmd: list[str] | str, cwd: Path | str) -> str:
     if isinstance(cwd, Path):
         cwd = str(cwd.resolve())
 
-    hash_input = f"{cmd}|{cwd}"
-    return hashlib.sha256(hash_input.encode("utf-8")).hexdigest()[:8]
+    return _cmd_hash(cmd, cwd)
+
+
+def suggestion_key(*parts: str) -> str:
+    """Generate a BLAKE2b key for analysis inputs. Used to locate cached suggestions."""
+    hash_input = "\0".join(parts)
+    return hashlib.blake2b(hash_input.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def suggestion_settings(config: "Configs") -> tuple[str, str, str]:
+    """
+    Settings that shape an LLM suggestion, as suggestion_key parts.
+
+    Model, custom prompt and API endpoint: changing any of them must not
+    serve a suggestion cached under the old ones.
+    """
+    return config.FIXER_MODEL, config.CUSTOM_PROMPT, config.OPENAI_API_BASE
+
+
+def load_suggestion(cache_dir: Path, key: str) -> FixSuggestion | None:
+    """Load a cached suggestion. Returns None on cache miss or invalid entry."""
+    suggestion_file = cache_dir / SUGGESTION_CACHE_DIRNAME / f"{key}.json"
+    try:
+        return FixSuggestion.model_validate_json(suggestion_file.read_bytes())
+    except FileNotFoundError:
+        return None
+    except ValueError as e:
+        ui.warning(f"Ignoring invalid cached suggestion {suggestion_file}: {e}")
+        return None
+
+
+def is_cacheable_suggestion(suggestion: FixSuggestion) -> bool:
+    """
+    Whether a suggestion may be persisted.
+
+    Zero-confidence results (e.g. the empty-response fallback) would be
+    replayed on every later run until --force, so they are never cached.
+    """
+    return suggestion.confidence > 0.0
+
+
+def save_suggestion(suggestion: FixSuggestion, cache_dir: Path, key: str) -> None:
+    """Save a suggestion to cache_dir/suggestions/<key>.json."""
+    suggestion_file = cache_dir / SUGGESTION_CACHE_DIRNAME / f"{key}.json"
+    try:
+        if not suggestion_file.parent.is_dir():
+            suggestion_file.parent.mkdir(parents=True, exist_ok=True)
+        suggestion_file.write_text(
+            suggestion.model_dump_json(indent=2), encoding="utf-8"
+        )
+        ui.debug(f"Cached suggestion to {suggestion_file}")
+    except OSError as e:
+        ui.warning(f"Failed to cache suggestion {suggestion_file}: {e}")
 
 
 def save_exec_output(
     content: CommandResult,
     output_dir: Optional[Path],
+    metadata_only: bool = False,
 ) -> None:
     """
     Save content to output_dir/ and print success.
+
+    With metadata_only, stdout.txt/stderr.txt are assumed to be written
+    already (Executor.execute(log_dir=...)) and only metadata.json is saved.
     """
 
     stdout_file = output_dir / "stdout.txt"
@@ -57,10 +185,12 @@ def save_exec_output(
     meta_file = output_dir / "metadata.json"
 
     try:
-        output_dir.mkdir(parents=True, exist_ok=True)
+        if not output_dir.is_dir():
+            output_dir.mkdir(parents=True, exist_ok=True)
 
-        stdout_file.write_text(content.stdout, encoding="utf-8")
-        stderr_file.write_text(content.stderr, encoding="utf-8")
+        if not metadata_only:
+            stdout_file.write_text(content.stdout, encoding="utf-8")
+            stderr_file.write_text(content.stderr, encoding="utf-8")
         meta_file.write_text(
             content.model_dump_json(
                 indent=2,
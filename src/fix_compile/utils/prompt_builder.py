@@ -1,5 +1,6 @@
 """Prompt builder for constructing system prompts with custom user requirements."""
 
+import functools
 from typing import Optional
 
 
@@ -24,6 +25,7 @@ Guidelines:
 4. Be minimal - only change what's necessary
 5. Always provide a clear explanation of what went wrong and why your fix works
 6. Consider the current working directory when specifying file paths (use relative paths)
+7. If the log shows several independent errors, fix all of them in this one suggestion
 
 You MUST respond with valid JSON matching this exact schema based on the fix type:
 
@@ -56,9 +58,12 @@ For DOCKER fixes:
     "dockerfile_content": "Complete new Dockerfile content",
     "confidence": 0.85,
     "changes_summary": "Brief summary of Dockerfile changes"
-}"""
+}
+
+Respond with the JSON object only: no markdown fences and no text before or after it."""
 
     @staticmethod
+    @functools.lru_cache(maxsize=32)
     def build_system_prompt(custom_prompt: Optional[str] = None) -> str:
         """
         Build complete system prompt with optional user customizations.
@@ -3,11 +3,11 @@ User Interface utilities for fix-compile.
 Handles console output (via Rich) and logging integration.
 """
 
+import functools
 import logging
 
 from rich.console import Console
-from rich.panel import Panel
-from rich.syntax import Syntax
+from rich.text import Text
 
 from fix_compile.constants import PROJECT_NAME
 
@@ -61,21 +61,61 @@ def step(message: str) -> None:
 # ---------------------------------------------------------
 
 
+# 按 pct // 10 (0..10) 查表：<60 red, 60-79 yellow, >=80 green
+_CONFIDENCE_STYLES: tuple[str, ...] = ("red",) * 6 + ("yellow",) * 2 + ("green",) * 3
+
+
+def confidence(score: float) -> None:
+    """Print a colored confidence score (0.0 to 1.0) and log as INFO."""
+    pct = round(score * 100)
+    style = _CONFIDENCE_STYLES[min(10, max(0, pct // 10))]
+
+    # 直接构造 Text，跳过 Rich 的 markup 解析
+    console.print(Text.assemble(("ℹ", "blue"), " Confidence: ", (f"{pct}%", style)))
+    logger.info(f"Confidence: {pct}%")
+
+
+@functools.cache
+def _dockerfile_highlighting():
+    """Resolve the Dockerfile lexer and monokai theme once per process.
+
+    Passing names to Syntax makes every call look them up again through
+    pygments' plugin registry.
+    """
+    from pygments.lexers import get_lexer_by_name
+    from rich.syntax import Syntax
+
+    return get_lexer_by_name("dockerfile"), Syntax.get_theme("monokai")
+
+
+def _dockerfile_syntax(code: str):
+    """Build a highlighted Syntax renderable for Dockerfile content."""
+    # rich.syntax pulls in pygments; only import it when something is rendered
+    from rich.syntax import Syntax
+
+    lexer, theme = _dockerfile_highlighting()
+    return Syntax(code, lexer, theme=theme, line_numbers=True)
+
+
 def print_dockerfile(dockerfile: str, title: str = "Dockerfile") -> None:
     """Print Dockerfile with syntax highlighting."""
+    from rich.panel import Panel
+
     logger.debug(f"Displaying Dockerfile ({title}):\n{dockerfile}")
 
-    syntax = Syntax(dockerfile, "dockerfile", theme="monokai", line_numbers=True)
+    syntax = _dockerfile_syntax(dockerfile)
     console.print(Panel(syntax, title=title, expand=False, border_style="blue"))
 
 
 def print_comparison(original: str, fixed: str) -> None:
     """Print side-by-side comparison (sequentially) of original and fixed."""
+    from rich.panel import Panel
+
     logger.info("Displaying comparison between original and fixed Dockerfiles")
 
     console.print(
         Panel(
-            Syntax(original, "dockerfile", theme="monokai", line_numbers=True),
+            _dockerfile_syntax(original),
             title="Original Dockerfile (Before)",
             style="red",
             expand=False,
@@ -83,7 +123,7 @@ def print_comparison(original: str, fixed: str) -> None:
     )
     console.print(
         Panel(
-            Syntax(fixed, "dockerfile", theme="monokai", line_numbers=True),
+            _dockerfile_syntax(fixed),
             title="Fixed Dockerfile (After)",
             style="green",
             expand=False,
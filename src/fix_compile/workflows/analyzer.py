@@ -1,7 +1,7 @@
 """Analyze Dockerfile build errors."""
 
 import re
-from typing import Optional
+from typing import ClassVar, Optional
 
 from ..schema import DockerfileProblem, ProblemType
 
@@ -41,6 +41,102 @@ class DockerfileAnalyzer:
         ],
     }
 
+    # 每种问题类型的模式合并为一个预编译正则，分析时不再逐条查 re 缓存
+    _COMPILED_PATTERNS: ClassVar[dict[ProblemType, re.Pattern[str]]] = {
+        problem_type: re.compile(
+            "|".join(f"(?:{pattern})" for pattern in patterns), re.IGNORECASE
+        )
+        for problem_type, patterns in ERROR_PATTERNS.items()
+    }
+
+    # Instructions accepted by the Dockerfile frontend
+    INSTRUCTIONS = frozenset(
+        {
+            "ADD",
+            "ARG",
+            "CMD",
+            "COPY",
+            "ENTRYPOINT",
+            "ENV",
+            "EXPOSE",
+            "FROM",
+            "HEALTHCHECK",
+            "LABEL",
+            "MAINTAINER",
+            "ONBUILD",
+            "RUN",
+            "SHELL",
+            "STOPSIGNAL",
+            "USER",
+            "VOLUME",
+            "WORKDIR",
+        }
+    )
+    _HEREDOC_RE = re.compile(r"<<-?\s*[\"']?(\w+)[\"']?")
+    _DIRECTIVE_RE = re.compile(r"#\s*([a-zA-Z]+)\s*=\s*(\S+)")
+
+    @staticmethod
+    def check_syntax(content: str) -> str | None:
+        """
+        Cheap structural check of Dockerfile text, without running docker.
+
+        Catches unknown instructions and a missing leading FROM, so a broken
+        suggestion is flagged before anyone spends a build on it. Honours
+        line continuations (also across comments and blank lines), heredocs
+        and the ``# escape=`` parser directive.
+
+        Args:
+            content: Dockerfile content
+
+        Returns:
+            Description of the first problem found, or None if none
+        """
+        escape = "\\"
+        directives_allowed = True
+        seen_from = False
+        continued = False
+        heredoc: str | None = None
+        for lineno, raw in enumerate(content.splitlines(), 1):
+            line = raw.strip()
+            if heredoc is not None:
+                if line == heredoc:
+                    heredoc = None
+                continue
+
+            # 解析器指令只能出现在文件开头，遇到其他内容后失效
+            if directives_allowed:
+                directive = DockerfileAnalyzer._DIRECTIVE_RE.fullmatch(line)
+                if directive:
+                    if directive.group(1).lower() == "escape":
+                        escape = directive.group(2)
+                    continue
+                directives_allowed = False
+
+            # 续行中的注释和空行不会结束指令
+            if not line or line.startswith("#"):
+                continue
+            if continued:
+                # 续行（上一行以转义符结尾）属于同一条指令
+                continued = line.endswith(escape)
+                continue
+
+            instruction = line.split(None, 1)[0].upper()
+            if instruction not in DockerfileAnalyzer.INSTRUCTIONS:
+                return f"line {lineno}: unknown instruction '{instruction}'"
+            if instruction == "FROM":
+                seen_from = True
+            elif not seen_from and instruction != "ARG":
+                return f"line {lineno}: {instruction} before the first FROM"
+
+            continued = line.endswith(escape)
+            match = DockerfileAnalyzer._HEREDOC_RE.search(line)
+            if match and instruction in ("RUN", "COPY", "ADD"):
+                heredoc = match.group(1)
+
+        if not seen_from:
+            return "no FROM instruction"
+        return None
+
     @staticmethod
     def analyze(
         dockerfile_path: str, error_message: str, build_context: Optional[str] = None
@@ -68,11 +164,10 @@ class DockerfileAnalyzer:
     @staticmethod
     def _identify_problem_type(error_message: str) -> ProblemType:
         """Identify the problem type from error message."""
-        error_lower = error_message.lower()
-
-        for problem_type, patterns in DockerfileAnalyzer.ERROR_PATTERNS.items():
-            for pattern in patterns:
-                if re.search(pattern, error_lower, re.IGNORECASE):
-                    return problem_type
+        # 按 ERROR_PATTERNS 的顺序逐类型搜索：先匹配的类型优先，
+        # 不受其他类型在同一段文本上的贪婪匹配影响
+        for problem_type, regex in DockerfileAnalyzer._COMPILED_PATTERNS.items():
+            if regex.search(error_message):
+                return problem_type
 
         return ProblemType.UNKNOWN
@@ -1,23 +1,147 @@
 """Docker fixer with auto-fix pipeline."""
 
-import json
-import os
+import re
 import subprocess
-import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING
 
 from fix_compile.config import Configs
 from fix_compile.executor import Executor
 from fix_compile.schema import (
-    CommandResult,
     DockerAnalysisContext,
+    DockerBuildConfig,
     GeneralAnalysisContext,
     OperationType,
 )
 from fix_compile.utils import ui
-from fix_compile.utils.io import cmd2hash
-from fix_compile.workflows.general_fixer import GeneralFixer
+from fix_compile.utils.io import (
+    cmd2hash,
+    is_cacheable_suggestion,
+    load_suggestion,
+    read_logs,
+    save_suggestion,
+    suggestion_key,
+    suggestion_settings,
+)
+from fix_compile.workflows.fast_rules import match_rule
+
+if TYPE_CHECKING:
+    from fix_compile.workflows.general_fixer import GeneralFixer
+
+# ============================================================================
+# Log normalization
+# ============================================================================
+
+# Per-run noise in docker output: ANSI colors, container / layer IDs of the
+# legacy builder, BuildKit step timings, image digests and timestamps
+_LOG_NOISE_PATTERNS: tuple[tuple[re.Pattern[str], str], ...] = (
+    (re.compile(r"\x1b\[[0-9;?]*[A-Za-z]"), ""),
+    (
+        re.compile(r"(Running in |---> |intermediate container )[0-9a-f]{12}\b"),
+        r"\1<ID>",
+    ),
+    (re.compile(r"^(#\d+) \d+\.\d+ ", re.MULTILINE), r"\1 "),
+    (re.compile(r" \d+\.\d+s$", re.MULTILINE), ""),
+    (re.compile(r"sha256:[0-9a-f]{64}"), "sha256:<SHA>"),
+    (
+        re.compile(
+            r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:\d{2})"
+        ),
+        "<TS>",
+    ),
+)
+
+
+def _normalize_error_log(log: str) -> str:
+    """
+    Replace per-run noise so identical failures produce identical logs.
+
+    Two runs of the same failing build then share a suggestion cache key,
+    and the LLM is not shown meaningless IDs.
+    """
+    for pattern, replacement in _LOG_NOISE_PATTERNS:
+        log = pattern.sub(replacement, log)
+    return log
+
+
+# ============================================================================
+# Base image pre-pull (legacy builder)
+# ============================================================================
+
+# FROM [--platform=...] <image> [AS <name>]
+_FROM_RE = re.compile(
+    r"^\s*FROM\s+(?:--\S+\s+)*(\S+)(?:\s+AS\s+(\S+))?",
+    re.IGNORECASE | re.MULTILINE,
+)
+_PREPULL_WORKERS = 4
+
+
+def _base_images(dockerfile_content: str) -> list[str]:
+    """
+    External base images of a Dockerfile, deduplicated in order.
+
+    Skips ``scratch``, references to earlier stages and images that depend
+    on build args (only docker can resolve those).
+    """
+    images: list[str] = []
+    stages: set[str] = set()
+    for match in _FROM_RE.finditer(dockerfile_content):
+        image, alias = match.groups()
+        if (
+            image.lower() not in stages
+            and image.lower() != "scratch"
+            and "$" not in image
+            and image not in images
+        ):
+            images.append(image)
+        if alias:
+            stages.add(alias.lower())
+    return images
+
+
+def _prepull_base_images(images: list[str], env: dict[str, str] | None) -> None:
+    """
+    Pull missing base images concurrently before a legacy-builder build.
+
+    The legacy builder pulls each stage's base image only when it reaches
+    that stage, one after another. Images already present are left alone,
+    as docker build without --pull would. Failures are ignored: the build
+    itself reports them.
+    """
+
+    def pull(image: str) -> None:
+        try:
+            inspect = subprocess.run(
+                ["docker", "image", "inspect", image],
+                capture_output=True,
+                env=env,
+                check=False,
+            )
+            if inspect.returncode != 0:
+                subprocess.run(
+                    ["docker", "pull", "-q", image],
+                    capture_output=True,
+                    env=env,
+                    check=False,
+                )
+        except OSError:
+            pass
+
+    ui.info(f"Pulling base images: {', '.join(images)}")
+    with ThreadPoolExecutor(max_workers=min(_PREPULL_WORKERS, len(images))) as pool:
+        list(pool.map(pull, images))
+
+
+def _read_dockerfile(dockerfile_path: Path) -> str | None:
+    """Read a Dockerfile in one open (no exists() stat); None if missing."""
+    try:
+        content = dockerfile_path.read_bytes().decode("utf-8")
+    except FileNotFoundError:
+        ui.debug(f"Dockerfile not found: {dockerfile_path}")
+        return None
+    ui.debug(f"Read Dockerfile from: {dockerfile_path}")
+    return content
 
 
 class DockerFixer:
@@ -32,102 +156,27 @@ class DockerFixer:
         """
         self.config = config
         self.executor = Executor()
-        # Pass custom_prompt from config to GeneralFixer
-        self.fixer = GeneralFixer(custom_prompt=config.CUSTOM_PROMPT)
-
-    def _execute_with_logging(
-        self,
-        cmd: list[str],
-        cwd: str,
-        stdout_file: Path,
-        stderr_file: Path,
-        env: dict = None,
-    ) -> CommandResult:
-        """
-        Execute command with real-time output streaming and file logging.
-
-        Args:
-            cmd: Command to execute
-            cwd: Working directory
-            stdout_file: File to write stdout
-            stderr_file: File to write stderr
-            env: Environment variables
+        self._fixer: GeneralFixer | None = None
 
-        Returns:
-            CommandResult with execution details
-        """
-        import shlex
+    @property
+    def fixer(self) -> "GeneralFixer":
+        """LLM fixer, built on first use so successful runs skip langchain."""
+        if self._fixer is None:
+            from fix_compile.workflows.general_fixer import GeneralFixer
 
-        cmd_str = shlex.join(cmd)
-        ui.info(f"🐳 Executing: {cmd_str}")
-
-        # Open files in write mode
-        with (
-            open(stdout_file, "w", encoding="utf-8") as f_out,
-            open(stderr_file, "w", encoding="utf-8") as f_err,
-        ):
-            # Start process
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                cwd=cwd,
-                env=env,
-                text=True,
-                bufsize=1,
-                universal_newlines=True,
-            )
-
-            stdout_lines = []
-            stderr_lines = []
-
-            # Read and write stdout in real-time
-            while True:
-                stdout_line = process.stdout.readline()
-                if stdout_line:
-                    stdout_lines.append(stdout_line)
-                    # Write to console
-                    ui.info(stdout_line.rstrip())
-                    sys.stdout.flush()
-                    # Write to file immediately
-                    f_out.write(stdout_line)
-                    f_out.flush()
-
-                # Check if process is done
-                if process.poll() is not None:
-                    break
-
-            # Capture remaining output
-            remaining_stdout = process.stdout.read()
-            if remaining_stdout:
-                stdout_lines.append(remaining_stdout)
-                ui.info(remaining_stdout.rstrip())
-                f_out.write(remaining_stdout)
-
-            # Read all stderr
-            stderr_output = process.stderr.read()
-            if stderr_output:
-                stderr_lines.append(stderr_output)
-                f_err.write(stderr_output)
-
-            exit_code = process.wait()
-
-        return CommandResult(
-            exit_code=exit_code,
-            stdout="".join(stdout_lines),
-            stderr="".join(stderr_lines),
-            success=(exit_code == 0),
-            command=cmd_str,
-            cwd=cwd,
-        )
+            # Pass custom_prompt from config to GeneralFixer
+            self._fixer = GeneralFixer(custom_prompt=self.config.CUSTOM_PROMPT)
+        return self._fixer
 
     def run_pipeline(
         self,
         cmd: list[str],
         cwd: Path,
-        dockerfile_path: Optional[Path] = None,
+        dockerfile_path: Path | None = None,
         no_fix: bool = False,
         force_rerun: bool = False,
+        dockerfile_content: str | None = None,
+        build_config: DockerBuildConfig | None = None,
     ) -> None:
         """
         Run Docker command with auto-fix pipeline.
@@ -137,11 +186,16 @@ class DockerFixer:
             cwd: Working directory
             dockerfile_path: Path to Dockerfile (for build commands)
             no_fix: Disable AI analysis and auto-fix
-            force_rerun: Force re-execution even if cached log exists
+            force_rerun: Force re-execution (and re-analysis) even if cached
+                log / suggestion exists
+            dockerfile_content: Dockerfile text already in memory; preferred
+                over reading dockerfile_path
+            build_config: Build settings for build commands (selects BuildKit
+                or the legacy builder); run commands inherit the environment
         """
-        # 1. Environment preparation: force DOCKER_BUILDKIT=0 for clear logs
-        env = os.environ.copy()
-        env["DOCKER_BUILDKIT"] = "0"
+        # 1. Environment preparation: builds pin DOCKER_BUILDKIT from
+        # build_config (legacy builder unless enabled); other commands inherit
+        env = Executor.docker_build_env(build_config) if build_config else None
 
         # 2. Cache calculation
         task_hash = cmd2hash(cmd, cwd)
@@ -156,36 +210,39 @@ class DockerFixer:
         # Check if we can skip execution
         if not force_rerun and stdout_file.exists() and stderr_file.exists():
             ui.info(f"📦 Using cached log from: {log_dir}")
-            stdout = stdout_file.read_text(encoding="utf-8")
-            stderr = stderr_file.read_text(encoding="utf-8")
-            error_log = stdout + stderr
+            # Logs hold raw build output; invalid UTF-8 is replaced
+            stdout, stderr = read_logs(stdout_file, stderr_file)
+            error_log = _normalize_error_log(stdout + stderr)
             success = False  # Assume cached logs are from failures
         else:
-            # Ensure log directory exists
-            log_dir.mkdir(parents=True, exist_ok=True)
-
-            # Execute with real-time file logging
-            result = self._execute_with_logging(
-                cmd=cmd,
-                cwd=str(cwd),
-                stdout_file=stdout_file,
-                stderr_file=stderr_file,
-                env=env,
+            if build_config is not None and not build_config.buildkit:
+                # BuildKit resolves stage images concurrently; the legacy
+                # builder does not, so overlap the pulls up front
+                if dockerfile_content is None and dockerfile_path:
+                    dockerfile_content = _read_dockerfile(dockerfile_path)
+                images = _base_images(dockerfile_content or "")
+                if len(images) > 1:
+                    _prepull_base_images(images, env)
+
+            # Execute with real-time file logging (creates log_dir)
+            result = self.executor.execute(
+                cmd, cwd=str(cwd), stream=True, log_dir=log_dir, env=env
             )
 
             # Save metadata.json (excluding stdout/stderr)
-            metadata = {
-                "exit_code": result.exit_code,
-                "success": result.success,
-                "command": result.command,
-                "cwd": result.cwd,
-            }
             metadata_file.write_text(
-                json.dumps(metadata, indent=2, ensure_ascii=False), encoding="utf-8"
+                result.model_dump_json(
+                    indent=2,
+                    ensure_ascii=False,
+                    exclude={"stdout", "stderr"},
+                ),
+                encoding="utf-8",
             )
             ui.debug(f"Saved logs to: {log_dir}")
 
-            error_log = (result.stdout or "") + (result.stderr or "")
+            error_log = _normalize_error_log(
+                (result.stdout or "") + (result.stderr or "")
+            )
             success = result.success
 
         # 4. Result handling
@@ -201,13 +258,18 @@ class DockerFixer:
             ui.info("Auto-fix disabled (--no-fix)")
             return
 
+        # Well-known errors get a templated fix without calling the LLM
+        suggestion = match_rule(error_log, cmd)
+        if suggestion is not None:
+            ui.info("⚡ Known error, skipping LLM")
+            self._display_suggestion(suggestion)
+            return
+
         ui.info("🧠 Analyzing error with LLM...")
 
-        # Read Dockerfile content if provided
-        dockerfile_content = None
-        if dockerfile_path and dockerfile_path.exists():
-            dockerfile_content = dockerfile_path.read_text(encoding="utf-8")
-            ui.debug(f"Read Dockerfile from: {dockerfile_path}")
+        # Read Dockerfile content if not provided
+        if dockerfile_content is None and dockerfile_path:
+            dockerfile_content = _read_dockerfile(dockerfile_path)
 
         # Determine operation type
         operation_type = OperationType.BUILD if "build" in cmd else OperationType.RUN
@@ -230,8 +292,21 @@ class DockerFixer:
                 cwd=str(cwd),
             )
 
-        # Analyze and get suggestion
-        suggestion = self.fixer.analyze(context)
+        # Analyze and get suggestion (same Dockerfile + log + settings -> cached)
+        cache_dir = self.config.dir_configs.cache_dir
+        key = suggestion_key(
+            operation_type.value,
+            dockerfile_content or "",
+            error_log,
+            *suggestion_settings(self.config),
+        )
+        suggestion = None if force_rerun else load_suggestion(cache_dir, key)
+        if suggestion is not None:
+            ui.info("📦 Using cached suggestion (use --force to re-analyze)")
+        else:
+            suggestion = self.fixer.analyze(context)
+            if is_cacheable_suggestion(suggestion):
+                save_suggestion(suggestion, cache_dir, key)
 
         # Display suggestion details
         self._display_suggestion(suggestion)
@@ -257,10 +332,8 @@ class DockerFixer:
                 suggestion.dockerfile_content, title="Suggested Dockerfile"
             )
 
-        ui.info(
-            f"Changes: {suggestion.changes_summary}\n"
-            f"Confidence: {suggestion.confidence:.0%}\n"
-        )
+        ui.info(f"Changes: {suggestion.changes_summary}\n")
+        ui.confidence(suggestion.confidence)
 
         ui.info(
             "💡 To apply the fix, review the suggestion and manually update your files."
@@ -0,0 +1,74 @@
+"""Rule-based fixes for well-known Docker errors (no LLM round-trip)."""
+
+import re
+import shlex
+from collections.abc import Callable
+
+from fix_compile.schema import FixSuggestion, FixType
+
+
+def _socket_permission(cmd: list[str]) -> FixSuggestion:
+    """Docker daemon socket not accessible by the current user."""
+    return FixSuggestion(
+        reason="The current user cannot access the Docker daemon socket",
+        fix_type=FixType.COMMAND,
+        command=shlex.join(["sudo", *cmd]),
+        command_explanation=(
+            "Run the command with sudo, or add yourself to the docker group "
+            "once with `sudo usermod -aG docker $USER` and log in again"
+        ),
+        confidence=0.95,
+        changes_summary="Run docker with root privileges",
+    )
+
+
+def _daemon_not_running(cmd: list[str]) -> FixSuggestion:
+    """Docker CLI cannot reach a daemon at all."""
+    return FixSuggestion(
+        reason="The Docker daemon is not running",
+        fix_type=FixType.COMMAND,
+        command="sudo systemctl start docker",
+        command_explanation=(
+            f"Start the daemon, then rerun `{shlex.join(cmd)}`. "
+            "On Docker Desktop, start the Docker Desktop application instead"
+        ),
+        confidence=0.9,
+        changes_summary="Start the Docker daemon",
+    )
+
+
+# Ordered (pattern, fix) pairs; the first pattern found in the log wins.
+# Patterns are narrow on purpose: anything else goes to the LLM.
+RULES: list[tuple[re.Pattern[str], Callable[[list[str]], FixSuggestion]]] = [
+    (
+        re.compile(
+            r"permission denied while trying to connect to the docker daemon socket",
+            re.IGNORECASE,
+        ),
+        _socket_permission,
+    ),
+    (
+        re.compile(
+            r"Cannot connect to the Docker daemon at .*Is the docker daemon running",
+            re.IGNORECASE,
+        ),
+        _daemon_not_running,
+    ),
+]
+
+
+def match_rule(error_log: str, cmd: list[str]) -> FixSuggestion | None:
+    """
+    Return a templated fix if the error log matches a known rule.
+
+    Args:
+        error_log: Error log of the failed command
+        cmd: The failed command
+
+    Returns:
+        FixSuggestion from the first matching rule, or None
+    """
+    for pattern, fix in RULES:
+        if pattern.search(error_log):
+            return fix(cmd)
+    return None
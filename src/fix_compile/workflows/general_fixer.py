@@ -1,19 +1,159 @@
 """Analyzer module - The Brain (LLM interaction logic)."""
 
-import json
+import functools
+import hashlib
+import re
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, ClassVar, Optional
 
 from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
 from pydantic import ValidationError
 
 from fix_compile.config import config_service
+from fix_compile.constants import DEFAULT_OPENAI_API_BASE, PROJECT_NAME
 from fix_compile.tools import execute_command
 from fix_compile.utils import ui
+from fix_compile.utils.dev_tool import setup_tracing_from_env
 from fix_compile.utils.prompt_builder import PromptBuilder
 
 from ..schema import FixSuggestion, FixType, GeneralAnalysisContext
+from .analyzer import DockerfileAnalyzer
+
+if TYPE_CHECKING:
+    import httpx
+    from langchain_openai import ChatOpenAI
+
+# Fenced JSON block in an LLM response (compiled once at import)
+_JSON_BLOCK_RE = re.compile(r"```(?:json)?[ \t]*\n(.*?)\n[ \t]*```", re.DOTALL)
+
+# Error logs longer than this are trimmed before they reach the prompt
+_MAX_LOG_LINES = 200
+# Lines kept before the first error marker, for context
+_LOG_CONTEXT_LINES = 10
+# Error-looking lines kept from the elided middle (deduplicated, within budget)
+_MAX_MIDDLE_ERROR_LINES = 50
+_ERROR_MARKER_RE = re.compile(
+    r"error|failed|cannot|not found|denied|\bE:\s", re.IGNORECASE
+)
+
+
+def _trim_error_log(log: str, max_lines: int = _MAX_LOG_LINES) -> str:
+    """
+    Elide the middle of a long error log.
+
+    Keeps a window starting just before the first error marker (usually the
+    root cause), distinct error-looking lines from the elided middle and the
+    tail (the final status): at most max_lines log lines in total, not
+    counting the omission markers.
+
+    Args:
+        log: Full error log
+        max_lines: Maximum number of log lines to keep
+
+    Returns:
+        The log unchanged if short enough, otherwise the trimmed log
+    """
+    lines = log.splitlines()
+    if len(lines) <= max_lines:
+        return log
+
+    # 中段错误行同样计入 max_lines 预算，余下由错误窗口和尾部平分
+    middle_budget = min(_MAX_MIDDLE_ERROR_LINES, max_lines // 4)
+    half = (max_lines - middle_budget) // 2
+    first = next(
+        (i for i, line in enumerate(lines) if _ERROR_MARKER_RE.search(line)), 0
+    )
+    tail_start = len(lines) - (max_lines - middle_budget - half)
+    start = max(0, first - min(_LOG_CONTEXT_LINES, half // 2))
+    if start + half >= tail_start:
+        # Error near the end: the last max_lines lines already cover it
+        start = len(lines) - max_lines
+        end = tail_start
+    else:
+        end = start + half
+
+    parts = []
+    if start > 0:
+        parts.append(f"... ({start} lines omitted) ...")
+    parts.extend(lines[start:end])
+    if tail_start > end:
+        middle = lines[end:tail_start]
+        matched = list(
+            dict.fromkeys(line for line in middle if _ERROR_MARKER_RE.search(line))
+        )[:middle_budget]
+        parts.append(
+            f"... ({len(middle) - len(matched)} lines omitted,"
+            f" {len(matched)} error lines kept) ..."
+        )
+        parts.extend(matched)
+    parts.extend(lines[tail_start:])
+    return "\n".join(parts)
+
+
+# Retries for 429 / 5xx / connection errors; the openai SDK backs off
+# exponentially and honours Retry-After between attempts
+_LLM_MAX_RETRIES = 4
+
+
+@functools.cache
+def _http_client() -> "httpx.Client":
+    """
+    One keep-alive connection pool shared by every ChatOpenAI client.
+
+    Clients for different models or base URLs still reuse open TLS
+    connections. openai's DefaultHttpxClient keeps the SDK's default
+    timeout, limits and redirect handling.
+    """
+    from openai import DefaultHttpxClient
+
+    return DefaultHttpxClient()
+
+
+@functools.lru_cache(maxsize=4)
+def _make_chat_openai(
+    model: str, api_key: str, base_url: str, prompt_cache_key: str | None
+) -> "ChatOpenAI":
+    """
+    Build a ChatOpenAI client, shared by fixers with the same settings.
+
+    Each client owns an httpx connection pool; reusing it across fixers
+    (batch runs, DockerFixer + fix in one process) keeps connections warm.
+
+    Args:
+        model: Model name
+        api_key: API key (only used as a cache key, never logged)
+        base_url: OpenAI-compatible API base URL
+        prompt_cache_key: Official-API prompt cache key, or None for
+            compatible servers
+
+    Returns:
+        ChatOpenAI client
+    """
+    # Heaviest import of the package: deferred until a client is built
+    from langchain_openai import ChatOpenAI
+
+    # OpenAI caches shared prefixes automatically; a stable prompt_cache_key
+    # routes requests with the same system prompt to the same cache.
+    # JSON mode stops the model from spending tokens on prose around the
+    # object. Only sent to the official API: compatible servers may reject
+    # either field.
+    extra_body = None
+    if prompt_cache_key is not None:
+        extra_body = {
+            "prompt_cache_key": prompt_cache_key,
+            "response_format": {"type": "json_object"},
+        }
+
+    return ChatOpenAI(
+        model=model,
+        api_key=api_key,
+        base_url=base_url,
+        extra_body=extra_body,
+        http_client=_http_client(),
+        max_retries=_LLM_MAX_RETRIES,
+    )
+
 
 # ============================================================================
 # GeneralFixer Class
@@ -28,6 +168,11 @@ class GeneralFixer:
     It only takes text inputs and produces structured outputs.
     """
 
+    # In-process memo: BLAKE2b(model, system prompt, user prompt) -> suggestion.
+    # Shared by all instances so retries within one run skip the LLM call.
+    _analysis_cache: ClassVar[OrderedDict[str, FixSuggestion]] = OrderedDict()
+    _ANALYSIS_CACHE_SIZE = 128
+
     def __init__(
         self,
         model: Optional[str] = None,
@@ -43,6 +188,9 @@ class GeneralFixer:
             custom_prompt: User custom prompt to append to system prompt (defaults to config)
         """
 
+        # Opt-in LLM tracing (FIX_COMPILE_TRACE), only on the analysis path
+        setup_tracing_from_env()
+
         self.config = config_service.config
         self.model = model or self.config.FIXER_MODEL
         api_key_value = api_key or self.config.OPENAI_API_KEY.get_secret_value()
@@ -50,10 +198,20 @@ class GeneralFixer:
             custom_prompt if custom_prompt is not None else self.config.CUSTOM_PROMPT
         )
 
-        self.client = ChatOpenAI(
-            model=self.model,
-            api_key=api_key_value,
-            base_url=self.config.OPENAI_API_BASE,
+        # System prompt only depends on custom_prompt: build it once per fixer.
+        # It is always the first message, so every request shares a static prefix.
+        system_prompt = PromptBuilder.build_system_prompt(self.custom_prompt)
+        self._system_message = SystemMessage(content=system_prompt)
+
+        prompt_cache_key = None
+        if self.config.OPENAI_API_BASE.rstrip("/") == DEFAULT_OPENAI_API_BASE:
+            digest = hashlib.blake2b(
+                system_prompt.encode("utf-8"), digest_size=8
+            ).hexdigest()
+            prompt_cache_key = f"{PROJECT_NAME}-{digest}"
+
+        self.client = _make_chat_openai(
+            self.model, api_key_value, self.config.OPENAI_API_BASE, prompt_cache_key
         )
 
     def analyze(self, context: GeneralAnalysisContext) -> FixSuggestion:
@@ -71,73 +229,155 @@ class GeneralFixer:
         """
         ui.info("🧠 Analyzing error with LLM...")
 
-        # Build system prompt with custom requirements
-        system_prompt = PromptBuilder.build_system_prompt(self.custom_prompt)
-
         # Build user prompt with context about the environment
         user_prompt = self._build_user_prompt(context)
 
+        cache_key = hashlib.blake2b(
+            f"{self.model}\0{self._system_message.content}\0{user_prompt}".encode(),
+            digest_size=16,
+        ).hexdigest()
+        cached = self._analysis_cache.get(cache_key)
+        if cached is not None:
+            self._analysis_cache.move_to_end(cache_key)
+            ui.info("📦 Reusing suggestion from this run")
+            return cached.model_copy(deep=True)
+
         try:
             # Call LLM with structured output
             messages = [
-                SystemMessage(content=system_prompt),
+                self._system_message,
                 HumanMessage(content=user_prompt),
             ]
 
-            response = self.client.invoke(
-                messages,
-                temperature=0.2,
-                max_tokens=self.config.MAX_TOKENS,
-            )
-
-            # Parse response
-            content = response.content
-            if not content:
-                ui.warning("LLM returned empty response")
-                return FixSuggestion(
-                    reason="LLM returned empty response",
-                    fix_type=FixType.COMMAND,
-                    command="",
-                    confidence=0.0,
-                    changes_summary="",
-                )
-
-            # Parse JSON and validate with Pydantic
-            fix_dict = json.loads(content)
-            fix = FixSuggestion(**fix_dict)
-
-            # Log the fix suggestion
-            ui.success(f"Analysis complete (confidence: {fix.confidence:.0%})")
-            ui.debug(f"Reason: {fix.reason}")
-            ui.debug(f"Fix Type: {fix.fix_type.value}")
-
-            # Display fix-specific information
-            if fix.fix_type == FixType.COMMAND:
-                ui.debug(f"Command: {fix.command}")
-                if fix.command_explanation:
-                    ui.debug(f"{fix.command_explanation}")
-            elif fix.fix_type == FixType.FILE:
-                ui.debug(f"File: {fix.file_path}")
-                if fix.file_explanation:
-                    ui.debug(f"{fix.file_explanation}")
-            elif fix.fix_type == FixType.DOCKER:
-                ui.debug(f"Dockerfile: {fix.dockerfile_path}")
-
-            ui.debug(f"{fix.changes_summary}")
-            ui.info("")  # Empty line for spacing
-
+            # Stream the completion: progress is visible while the model is
+            # still generating, and long generations keep the connection busy
+            parts: list[str] = []
+            received = 0
+            with ui.console.status("Waiting for LLM response...") as status:
+                for chunk in self.client.stream(
+                    messages,
+                    temperature=0.2,
+                    max_tokens=self.config.MAX_TOKENS,
+                ):
+                    if chunk.content:
+                        parts.append(chunk.content)
+                        received += len(chunk.content)
+                        status.update(f"Receiving LLM response... {received} chars")
+
+            content = "".join(parts)
+            fix = self._parse_response(content)
+            if content:  # 空响应的兜底结果不缓存，重试时重新请求
+                self._analysis_cache[cache_key] = fix.model_copy(deep=True)
+                if len(self._analysis_cache) > self._ANALYSIS_CACHE_SIZE:
+                    self._analysis_cache.popitem(last=False)
             return fix
 
         except ValidationError as e:
             ui.error(f"LLM response validation failed: {e}")
             raise
-        except json.JSONDecodeError as e:
-            ui.error(f"Failed to parse LLM JSON response: {e}")
-            raise
         except Exception as e:
             ui.error(f"Analysis failed: {e}")
             raise
 
+    def analyze_batch(
+        self,
+        contexts: list[GeneralAnalysisContext],
+        max_concurrency: int = 4,
+    ) -> list[FixSuggestion | Exception]:
+        """
+        Analyze several contexts with concurrent LLM requests.
+
+        Every request shares the fixer's system message, so the provider sees
+        an identical prompt prefix across the batch.
+
+        Args:
+            contexts: Analysis contexts, one per error log
+            max_concurrency: Maximum number of in-flight LLM requests
+
+        Returns:
+            One FixSuggestion per context, in order. A failed item holds the
+            exception instead, so one bad response does not abort the batch.
+        """
+        ui.info(f"🧠 Analyzing {len(contexts)} errors with LLM...")
+
+        inputs = [
+            [
+                self._system_message,
+                HumanMessage(content=self._build_user_prompt(context)),
+            ]
+            for context in contexts
+        ]
+
+        responses = self.client.batch(
+            inputs,
+            config={"max_concurrency": max_concurrency},
+            return_exceptions=True,
+            temperature=0.2,
+            max_tokens=self.config.MAX_TOKENS,
+        )
+
+        results: list[FixSuggestion | Exception] = []
+        for response in responses:
+            if isinstance(response, Exception):
+                ui.error(f"Analysis failed: {response}")
+                results.append(response)
+                continue
+            try:
+                results.append(self._parse_response(response.content))
+            except ValidationError as e:
+                ui.error(f"Failed to parse LLM response: {e}")
+                results.append(e)
+
+        return results
+
+    def _parse_response(self, content: str) -> FixSuggestion:
+        """Parse and validate the LLM JSON response into a FixSuggestion."""
+        if not content:
+            ui.warning("LLM returned empty response")
+            return FixSuggestion(
+                reason="LLM returned empty response",
+                fix_type=FixType.COMMAND,
+                command="",
+                confidence=0.0,
+                changes_summary="",
+            )
+
+        # Some models wrap the JSON in a ```json fence; unwrap it first
+        if not content.lstrip().startswith("{"):
+            match = _JSON_BLOCK_RE.search(content)
+            if match:
+                content = match.group(1)
+
+        # Parse and validate in one pass (pydantic-core), no intermediate dict.
+        # Malformed JSON surfaces as a ValidationError too.
+        fix = FixSuggestion.model_validate_json(content)
+
+        # Log the fix suggestion
+        ui.success(f"Analysis complete (confidence: {fix.confidence:.0%})")
+        ui.debug(f"Reason: {fix.reason}")
+        ui.debug(f"Fix Type: {fix.fix_type.value}")
+
+        # Display fix-specific information
+        if fix.fix_type == FixType.COMMAND:
+            ui.debug(f"Command: {fix.command}")
+            if fix.command_explanation:
+                ui.debug(f"{fix.command_explanation}")
+        elif fix.fix_type == FixType.FILE:
+            ui.debug(f"File: {fix.file_path}")
+            if fix.file_explanation:
+                ui.debug(f"{fix.file_explanation}")
+        elif fix.fix_type == FixType.DOCKER:
+            ui.debug(f"Dockerfile: {fix.dockerfile_path}")
+            # Flag a broken Dockerfile now rather than after a failed build
+            problem = DockerfileAnalyzer.check_syntax(fix.dockerfile_content or "")
+            if problem:
+                ui.warning(f"Suggested Dockerfile failed a syntax check: {problem}")
+
+        ui.debug(f"{fix.changes_summary}")
+        ui.info("")  # Empty line for spacing
+
+        return fix
+
     def _build_user_prompt(self, context: GeneralAnalysisContext) -> str:
         """Build the user prompt from context with file system information."""
         prompt_parts = [
@@ -166,7 +406,7 @@ class GeneralFixer:
             [
                 "",
                 "=== ERROR LOG ===",
-                context.error_log,
+                _trim_error_log(context.error_log),
             ]
         )
 
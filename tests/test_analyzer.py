@@ -0,0 +1,116 @@
+"""Tests for DockerfileAnalyzer."""
+
+from fix_compile.schema import ProblemType
+from fix_compile.workflows.analyzer import DockerfileAnalyzer
+
+
+class TestIdentifyProblemType:
+    """Problem classification follows ERROR_PATTERNS priority."""
+
+    def test_overlapping_lower_priority_match_does_not_win(self):
+        """A greedy IMAGE_NOT_FOUND match must not hide PATH_NOT_FOUND."""
+        error_msg = (
+            "Error response from daemon: x   stat foo not found "
+            "No such file or directory"
+        )
+
+        problem_type = DockerfileAnalyzer._identify_problem_type(error_msg)
+
+        assert problem_type == ProblemType.PATH_NOT_FOUND
+
+    def test_priority_order_when_several_types_match(self):
+        """The first type in ERROR_PATTERNS order wins."""
+        error_msg = "syntax error\npermission denied"
+
+        problem_type = DockerfileAnalyzer._identify_problem_type(error_msg)
+
+        assert problem_type == ProblemType.PERMISSION_DENIED
+
+    def test_unknown_when_nothing_matches(self):
+        """Unmatched logs are UNKNOWN."""
+        assert (
+            DockerfileAnalyzer._identify_problem_type("all good") == ProblemType.UNKNOWN
+        )
+
+
+class TestCheckSyntax:
+    """Structural Dockerfile check used on LLM suggestions."""
+
+    def test_valid_dockerfile(self):
+        """A plain Dockerfile passes."""
+        content = 'FROM ubuntu:22.04\nRUN apt-get update\nCMD ["bash"]\n'
+
+        assert DockerfileAnalyzer.check_syntax(content) is None
+
+    def test_comment_inside_continuation(self):
+        """A comment line does not end a continued instruction."""
+        content = (
+            "FROM ubuntu:22.04\n"
+            "RUN apt-get update && \\\n"
+            "# install curl\n"
+            "    apt-get install -y curl\n"
+        )
+
+        assert DockerfileAnalyzer.check_syntax(content) is None
+
+    def test_blank_line_inside_continuation(self):
+        """A blank line does not end a continued instruction."""
+        content = (
+            "FROM ubuntu:22.04\n"
+            "RUN apt-get update && \\\n"
+            "\n"
+            "    apt-get install -y curl\n"
+        )
+
+        assert DockerfileAnalyzer.check_syntax(content) is None
+
+    def test_escape_directive(self):
+        """The escape parser directive changes the continuation character."""
+        content = (
+            "# escape=`\n"
+            "FROM mcr.microsoft.com/windows/servercore:ltsc2022\n"
+            "COPY testfile.txt C:\\\n"
+            "RUN dir C:\\ `\n"
+            "    && echo done\n"
+        )
+
+        assert DockerfileAnalyzer.check_syntax(content) is None
+
+    def test_heredoc(self):
+        """Heredoc bodies are not parsed as instructions."""
+        content = (
+            "FROM ubuntu:22.04\n"
+            "RUN <<EOF\n"
+            "set -e\n"
+            "apt-get update\n"
+            "EOF\n"
+            "COPY <<-'CONF' /etc/app.conf\n"
+            "key=value\n"
+            "CONF\n"
+        )
+
+        assert DockerfileAnalyzer.check_syntax(content) is None
+
+    def test_arg_before_from(self):
+        """ARG may precede the first FROM; other instructions may not."""
+        assert (
+            DockerfileAnalyzer.check_syntax("ARG VERSION=22.04\nFROM ubuntu:$VERSION")
+            is None
+        )
+        assert (
+            DockerfileAnalyzer.check_syntax("RUN echo hi\nFROM ubuntu:22.04")
+            == "line 1: RUN before the first FROM"
+        )
+
+    def test_unknown_instruction(self):
+        """Misspelled instructions are reported with their line number."""
+        content = "FROM ubuntu:22.04\nRUNN apt-get update\n"
+
+        assert (
+            DockerfileAnalyzer.check_syntax(content)
+            == "line 2: unknown instruction 'RUNN'"
+        )
+
+    def test_missing_from(self):
+        """A Dockerfile without FROM is reported."""
+        assert DockerfileAnalyzer.check_syntax("ARG X=1\n") == "no FROM instruction"
@@ -0,0 +1,195 @@
+"""Tests for fix-batch manifest parsing and GeneralFixer.analyze_batch."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+from pydantic import ValidationError
+from typer.testing import CliRunner
+
+from cli.main import _read_batch_entry
+from fix_compile.config import config_service
+from fix_compile.schema import FixSuggestion, FixType, GeneralAnalysisContext
+from fix_compile.utils.io import (
+    save_suggestion,
+    suggestion_key,
+    suggestion_settings,
+)
+from fix_compile.workflows.general_fixer import GeneralFixer
+
+
+class TestReadBatchEntry:
+    """Manifest lines are validated one by one."""
+
+    def test_inline_error_log(self):
+        """error_log text is used as is."""
+        entry, error_log = _read_batch_entry(
+            json.dumps({"error_log": "boom", "cwd": "/tmp"})
+        )
+
+        assert entry["cwd"] == "/tmp"
+        assert error_log == "boom"
+
+    def test_log_file(self, tmp_path):
+        """log_file is read from disk."""
+        log_file = tmp_path / "build.log"
+        log_file.write_text("error: missing header\n", encoding="utf-8")
+
+        _, error_log = _read_batch_entry(json.dumps({"log_file": str(log_file)}))
+
+        assert error_log == "error: missing header\n"
+
+    def test_missing_log_file(self, tmp_path):
+        """A mistyped log_file is an error, not an empty log."""
+        line = json.dumps({"log_file": str(tmp_path / "nope.log")})
+
+        with pytest.raises(ValueError, match="cannot read log_file"):
+            _read_batch_entry(line)
+
+    def test_empty_log(self, tmp_path):
+        """An empty log is rejected instead of being sent to the LLM."""
+        log_file = tmp_path / "empty.log"
+        log_file.write_text("", encoding="utf-8")
+
+        with pytest.raises(ValueError, match="empty"):
+            _read_batch_entry(json.dumps({"log_file": str(log_file)}))
+
+    def test_entry_without_log(self):
+        """An entry naming no log is rejected."""
+        with pytest.raises(ValueError, match='"error_log" or "log_file"'):
+            _read_batch_entry(json.dumps({"cwd": "/tmp"}))
+
+    def test_non_object_line(self):
+        """A JSON value that is not an object is rejected."""
+        with pytest.raises(TypeError, match="not a JSON object"):
+            _read_batch_entry(json.dumps(["error_log", "boom"]))
+
+    @pytest.mark.parametrize("field", ["cwd", "output"])
+    def test_non_string_path(self, field):
+        """cwd and output must be strings when present."""
+        line = json.dumps({"error_log": "boom", field: 1})
+
+        with pytest.raises(TypeError, match=f'"{field}" must be a string'):
+            _read_batch_entry(line)
+
+    def test_invalid_json(self):
+        """Malformed JSON is a ValueError like every other bad entry."""
+        with pytest.raises(ValueError):
+            _read_batch_entry("{not json")
+
+
+class TestAnalyzeBatch:
+    """analyze_batch keeps one result per context, failures included."""
+
+    @pytest.fixture
+    def fixer(self, monkeypatch):
+        # Bypass __init__: no config, API key or network needed
+        fixer = GeneralFixer.__new__(GeneralFixer)
+        fixer._system_message = SimpleNamespace(content="system")
+        fixer.config = SimpleNamespace(MAX_TOKENS=1024)
+        monkeypatch.setattr(
+            fixer, "_build_user_prompt", lambda context: context.error_log
+        )
+        return fixer
+
+    def test_failures_are_returned_in_place(self, fixer):
+        """Errors from the client and from parsing do not abort the batch."""
+        good = json.dumps(
+            {
+                "reason": "missing dependency",
+                "fix_type": "command",
+                "command": "pip install numpy",
+                "confidence": 0.9,
+                "changes_summary": "install numpy",
+            }
+        )
+        rate_limited = RuntimeError("429 Too Many Requests")
+        calls = {}
+
+        def batch(inputs, config, return_exceptions, **kwargs):
+            calls.update(config=config, return_exceptions=return_exceptions)
+            return [
+                SimpleNamespace(content=good),
+                rate_limited,
+                SimpleNamespace(content="not json"),
+            ]
+
+        fixer.client = SimpleNamespace(batch=batch)
+        contexts = [
+            GeneralAnalysisContext(error_log=f"log {i}", cwd="/tmp") for i in range(3)
+        ]
+
+        results = fixer.analyze_batch(contexts, max_concurrency=2)
+
+        assert calls == {"config": {"max_concurrency": 2}, "return_exceptions": True}
+        assert len(results) == 3
+        assert isinstance(results[0], FixSuggestion)
+        assert results[0].command == "pip install numpy"
+        assert results[1] is rate_limited
+        assert isinstance(results[2], ValidationError)
+
+
+class TestFixBatchCommand:
+    """fix-batch end to end, served from the suggestion cache (no LLM)."""
+
+    @pytest.fixture
+    def cache_dir(self, tmp_path, monkeypatch):
+        cache_dir = tmp_path / "cache"
+        monkeypatch.setattr(config_service, "load_config", lambda **kwargs: None)
+        monkeypatch.setattr(
+            config_service,
+            "_settings",
+            SimpleNamespace(
+                FIXER_MODEL="model",
+                CUSTOM_PROMPT="",
+                OPENAI_API_BASE="https://api.example.com/v1",
+                dir_configs=SimpleNamespace(cache_dir=cache_dir),
+            ),
+        )
+        monkeypatch.chdir(tmp_path)
+        return cache_dir
+
+    @staticmethod
+    def _cache(cache_dir, cwd, error_log):
+        suggestion = FixSuggestion(
+            reason="missing dependency",
+            fix_type=FixType.COMMAND,
+            command="pip install numpy",
+            confidence=0.9,
+            changes_summary="install numpy",
+        )
+        key = suggestion_key(
+            "", str(cwd), error_log, *suggestion_settings(config_service.config)
+        )
+        save_suggestion(suggestion, cache_dir, key)
+
+    def _run(self, tmp_path, *entries):
+        import cli
+
+        manifest = tmp_path / "manifest.jsonl"
+        manifest.write_text("\n".join(json.dumps(e) for e in entries))
+        return CliRunner().invoke(cli.app, ["fix-batch", str(manifest)])
+
+    def test_relative_cwd_shares_fix_cache_key(self, tmp_path, cache_dir):
+        """A relative cwd is resolved, like `fix --text`, before keying."""
+        self._cache(cache_dir, tmp_path.resolve(), "boom")
+
+        result = self._run(tmp_path, {"error_log": "boom", "cwd": "."})
+
+        assert result.exit_code == 0, result.output
+        assert "1 cached, 0 invalid, 0 to analyze" in result.output
+
+    def test_unwritable_output_fails_entry(self, tmp_path, cache_dir):
+        """An output that cannot be written fails its entry, not the batch."""
+        self._cache(cache_dir, tmp_path.resolve(), "boom")
+        (tmp_path / "blocker").write_text("")
+
+        result = self._run(
+            tmp_path,
+            {"error_log": "boom", "output": str(tmp_path / "blocker" / "out.json")},
+            {"error_log": "boom", "output": str(tmp_path / "out" / "ok.json")},
+        )
+
+        assert result.exit_code == 1
+        assert "cannot save suggestion" in result.output
+        assert (tmp_path / "out" / "ok.json").exists()
@@ -0,0 +1,184 @@
+"""Tests for the CLI app."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+from typer.testing import CliRunner
+
+from fix_compile.config import config_service
+
+
+class TestApp:
+    """Programmatic use of cli.app."""
+
+    @pytest.mark.parametrize("subapp", ["config", "docker"])
+    def test_subapps_registered(self, subapp):
+        """Sub-apps are available on cli.app without going through main()."""
+        import cli
+
+        result = CliRunner().invoke(cli.app, [subapp, "--help"])
+
+        assert result.exit_code == 0, result.output
+        assert "Usage:" in result.output
+
+    def test_register_is_idempotent(self):
+        """Registering again (e.g. main() after cli.app) adds no duplicates."""
+        import cli
+        import cli.main
+
+        cli.main._register_subapps(["fix-compile"])
+        names = [group.name for group in cli.app.registered_groups]
+
+        assert sorted(names) == ["config", "docker"]
+
+
+@pytest.fixture
+def build_calls(monkeypatch):
+    """Run `docker build` without docker: record run_pipeline arguments."""
+    import fix_compile.workflows.docker_fixer as docker_fixer
+
+    calls = []
+
+    class FakeFixer:
+        def __init__(self, config):
+            pass
+
+        def run_pipeline(self, **kwargs):
+            calls.append(kwargs)
+
+    monkeypatch.setattr(config_service, "load_config", lambda **kwargs: None)
+    monkeypatch.setattr(
+        config_service, "_settings", SimpleNamespace(DOCKER_BUILDKIT=False)
+    )
+    monkeypatch.setattr(docker_fixer, "DockerFixer", FakeFixer)
+    return calls
+
+
+class TestDockerBuild:
+    """BuildKit selection for the external cache options."""
+
+    def test_cache_options_enable_buildkit(self, build_calls):
+        """--cache-from/--cache-to turn BuildKit on when it is off by default."""
+        import cli
+
+        result = CliRunner().invoke(
+            cli.app,
+            [
+                "docker",
+                "build",
+                "--cache-from",
+                "type=local,src=/c",
+                "--cache-to",
+                "type=local,dest=/c",
+                ".",
+            ],
+        )
+
+        assert result.exit_code == 0, result.output
+        (call,) = build_calls
+        assert call["build_config"].buildkit
+        assert call["cmd"][-4:] == [
+            "type=local,src=/c",
+            "--cache-to",
+            "type=local,dest=/c",
+            ".",
+        ]
+
+    def test_cache_options_reject_no_buildkit(self, build_calls):
+        """An explicit --no-buildkit with a cache option fails before building."""
+        import cli
+
+        result = CliRunner().invoke(
+            cli.app,
+            [
+                "docker",
+                "build",
+                "--no-buildkit",
+                "--cache-from",
+                "type=local,src=/c",
+                ".",
+            ],
+        )
+
+        assert result.exit_code == 1
+        assert "require BuildKit" in result.output
+        assert build_calls == []
+
+    def test_default_follows_config(self, build_calls):
+        """Without cache options the DOCKER_BUILDKIT config key decides."""
+        import cli
+
+        result = CliRunner().invoke(cli.app, ["docker", "build", "."])
+
+        assert result.exit_code == 0, result.output
+        assert not build_calls[0]["build_config"].buildkit
+
+
+@pytest.fixture
+def fix_inputs(tmp_path, monkeypatch):
+    """Run `fix` without the LLM: record suggestion key parts, serve a hit."""
+    import fix_compile.utils.io as io
+    from fix_compile.schema import FixSuggestion, FixType
+
+    inputs = []
+
+    def fake_key(*parts):
+        inputs.append(parts)
+        return "key"
+
+    suggestion = FixSuggestion(
+        reason="missing dependency",
+        fix_type=FixType.COMMAND,
+        command="pip install numpy",
+        confidence=0.9,
+        changes_summary="install numpy",
+    )
+    monkeypatch.setattr(config_service, "load_config", lambda **kwargs: None)
+    monkeypatch.setattr(
+        config_service,
+        "_settings",
+        SimpleNamespace(
+            FIXER_MODEL="model",
+            CUSTOM_PROMPT="",
+            OPENAI_API_BASE="https://api.example.com/v1",
+            dir_configs=SimpleNamespace(cache_dir=tmp_path / "cache"),
+        ),
+    )
+    monkeypatch.setattr(io, "suggestion_key", fake_key)
+    monkeypatch.setattr(io, "load_suggestion", lambda cache_dir, key: suggestion)
+    return inputs
+
+
+class TestFixLogDir:
+    """fix --log-dir accepts a log file or a saved exec directory."""
+
+    def test_log_file_with_invalid_utf8(self, tmp_path, fix_inputs):
+        """Undecodable bytes in a log file are replaced, not fatal."""
+        import cli
+
+        log_file = tmp_path / "build.log"
+        log_file.write_bytes(b"caf\xe9 error\n")
+
+        result = CliRunner().invoke(cli.app, ["fix", "--log-dir", str(log_file)])
+
+        assert result.exit_code == 0, result.output
+        assert fix_inputs[0][2] == "caf� error\n"
+
+    def test_exec_directory(self, tmp_path, fix_inputs):
+        """A directory is read as saved exec output (metadata + logs)."""
+        import cli
+
+        log_dir = tmp_path / "exec"
+        log_dir.mkdir()
+        (log_dir / "metadata.json").write_text(
+            json.dumps({"command": "make", "cwd": str(tmp_path)})
+        )
+        (log_dir / "stderr.txt").write_bytes(b"make: *** [all] Error 1\n")
+
+        result = CliRunner().invoke(cli.app, ["fix", "--log-dir", str(log_dir)])
+
+        assert result.exit_code == 0, result.output
+        cmd, _, error_log, *_ = fix_inputs[0]
+        assert cmd == "make"
+        assert error_log.endswith("STDERR:\nmake: *** [all] Error 1\n")
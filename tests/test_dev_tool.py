@@ -0,0 +1,29 @@
+"""Tests for the opt-in Phoenix tracing setup."""
+
+import fix_compile.utils.dev_tool as dev_tool
+
+
+class TestSetupTracingFromEnv:
+    """Tracing is registered only when FIX_COMPILE_TRACE is set."""
+
+    def test_off_by_default(self, monkeypatch):
+        """Without the variable Phoenix is never set up."""
+        calls = []
+        monkeypatch.delenv(dev_tool.TRACE_ENV_VAR, raising=False)
+        monkeypatch.setattr(dev_tool, "setup_phoenix_tracing", lambda: calls.append(1))
+        dev_tool.setup_tracing_from_env.cache_clear()
+
+        assert dev_tool.setup_tracing_from_env() is False
+        assert calls == []
+
+    def test_enabled_once(self, monkeypatch):
+        """With the variable set, tracing is registered once per process."""
+        calls = []
+        monkeypatch.setenv(dev_tool.TRACE_ENV_VAR, "1")
+        monkeypatch.setattr(dev_tool, "setup_phoenix_tracing", lambda: calls.append(1))
+        dev_tool.setup_tracing_from_env.cache_clear()
+
+        assert dev_tool.setup_tracing_from_env() is True
+        assert dev_tool.setup_tracing_from_env() is True
+        assert calls == [1]
+        dev_tool.setup_tracing_from_env.cache_clear()
@@ -0,0 +1,199 @@
+"""Tests for the docker fixer."""
+
+import subprocess
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+import fix_compile.workflows.docker_fixer as docker_fixer
+from fix_compile.executor import Executor
+from fix_compile.schema import DockerBuildConfig, FixSuggestion, FixType
+from fix_compile.workflows.docker_fixer import (
+    DockerFixer,
+    _base_images,
+    _normalize_error_log,
+    _prepull_base_images,
+)
+
+SHA = "sha256:" + "0123456789abcdef" * 4
+
+
+class TestNormalizeErrorLog:
+    """Per-run noise removed by _normalize_error_log."""
+
+    def test_ansi_codes(self):
+        """Colour and cursor escape codes are stripped."""
+        log = "\x1b[31mERROR\x1b[0m: failed\x1b[?25h"
+
+        assert _normalize_error_log(log) == "ERROR: failed"
+
+    def test_container_and_layer_ids(self):
+        """Legacy builder container and layer IDs are masked."""
+        log = (
+            " ---> Running in 3f2a1b4c5d6e\n"
+            " ---> 9a8b7c6d5e4f\n"
+            "Removing intermediate container 3f2a1b4c5d6e"
+        )
+
+        assert _normalize_error_log(log) == (
+            " ---> Running in <ID>\n ---> <ID>\nRemoving intermediate container <ID>"
+        )
+
+    def test_sha256_digests(self):
+        """Image and layer digests are masked."""
+        log = f"FROM docker.io/library/python:3.12@{SHA}"
+
+        assert _normalize_error_log(log) == (
+            "FROM docker.io/library/python:3.12@sha256:<SHA>"
+        )
+
+    def test_timestamps(self):
+        """RFC 3339 timestamps are masked."""
+        log = "2026-10-15T12:34:56.789Z error\n2026-10-15T12:34:56+02:00 done"
+
+        assert _normalize_error_log(log) == "<TS> error\n<TS> done"
+
+    def test_buildkit_timings(self):
+        """BuildKit step offsets and durations are dropped."""
+        log = "#8 12.34 E: Unable to locate package libfoo-dev\n#8 DONE 0.5s"
+
+        assert _normalize_error_log(log) == (
+            "#8 E: Unable to locate package libfoo-dev\n#8 DONE"
+        )
+
+    def test_identical_failures_match(self):
+        """Two runs of the same failure normalize to the same log."""
+        first = "#5 1.20 ERROR: boom\n#5 ERROR 1.3s\n ---> Running in 111111111111"
+        second = "#5 0.98 ERROR: boom\n#5 ERROR 1.1s\n ---> Running in 222222222222"
+
+        assert _normalize_error_log(first) == _normalize_error_log(second)
+
+    def test_package_names_and_paths_survive(self):
+        """Versions, package names and paths are left alone."""
+        log = (
+            "ERROR: No matching distribution found for numpy==1.26.4\n"
+            "COPY failed: stat /var/lib/docker/tmp/app/requirements.txt: "
+            "no such file or directory\n"
+            "E: Unable to locate package python3.12-venv\n"
+            "ModuleNotFoundError: No module named 'deadbeef1234'"
+        )
+
+        assert _normalize_error_log(log) == log
+
+
+MULTI_STAGE = """\
+# syntax=docker/dockerfile:1
+ARG BASE=python:3.12
+FROM --platform=linux/amd64 golang:1.22 AS build
+FROM build AS test
+from node:20-slim as assets
+FROM ${BASE}
+FROM scratch
+FROM golang:1.22
+"""
+
+
+class TestBaseImages:
+    """FROM parsing for the base image pre-pull."""
+
+    def test_external_images_only(self):
+        """Stages, scratch, build-arg images and duplicates are skipped."""
+        assert _base_images(MULTI_STAGE) == ["golang:1.22", "node:20-slim"]
+
+
+class TestPrepullBaseImages:
+    """Concurrent pulls of missing base images."""
+
+    def test_pulls_only_missing_images(self, monkeypatch):
+        """Images already present are not pulled again."""
+        calls = []
+
+        def fake_run(cmd, **kwargs):
+            calls.append(cmd)
+            present = cmd[1] == "image" and cmd[-1] == "golang:1.22"
+            return subprocess.CompletedProcess(cmd, 0 if present else 1)
+
+        monkeypatch.setattr(docker_fixer.subprocess, "run", fake_run)
+        _prepull_base_images(["golang:1.22", "node:20-slim"], env=None)
+
+        pulls = [cmd for cmd in calls if cmd[1] == "pull"]
+        assert pulls == [["docker", "pull", "-q", "node:20-slim"]]
+
+
+@pytest.fixture
+def fixer(tmp_path):
+    """DockerFixer with its cache under tmp_path (no config file needed)."""
+    fixer = DockerFixer.__new__(DockerFixer)
+    fixer.config = SimpleNamespace(
+        FIXER_MODEL="model",
+        CUSTOM_PROMPT="",
+        OPENAI_API_BASE="https://api.example.com/v1",
+        dir_configs=SimpleNamespace(cache_dir=tmp_path / "cache"),
+    )
+    fixer.executor = Executor()
+    return fixer
+
+
+class TestRunPipeline:
+    """Execution and cached-log reuse in run_pipeline."""
+
+    @pytest.mark.parametrize("buildkit", [False, True])
+    def test_prepull_with_legacy_builder(self, fixer, tmp_path, monkeypatch, buildkit):
+        """Base images are pre-pulled only when the legacy builder runs."""
+        pulled = []
+        monkeypatch.setattr(
+            docker_fixer,
+            "_prepull_base_images",
+            lambda images, env: pulled.append(images),
+        )
+        (tmp_path / "Dockerfile").write_text(MULTI_STAGE)
+
+        fixer.run_pipeline(
+            [sys.executable, "-c", "pass"],
+            cwd=tmp_path,
+            dockerfile_path=tmp_path / "Dockerfile",
+            build_config=DockerBuildConfig(buildkit=buildkit),
+        )
+
+        assert pulled == ([] if buildkit else [["golang:1.22", "node:20-slim"]])
+
+    def test_cached_log_with_invalid_utf8(self, fixer, tmp_path):
+        """A cached log that is not valid UTF-8 is reused without crashing."""
+        cmd = [
+            sys.executable,
+            "-c",
+            "import sys; sys.stderr.buffer.write(b'caf\\xe9 error\\n'); sys.exit(1)",
+        ]
+
+        fixer.run_pipeline(cmd, cwd=tmp_path, no_fix=True)
+        fixer.run_pipeline(cmd, cwd=tmp_path, no_fix=True)
+
+        (log_dir,) = Path(tmp_path / "cache").iterdir()
+        assert (log_dir / "stderr.txt").read_bytes() == b"caf\xe9 error\n"
+
+    def test_custom_prompt_change_skips_cached_suggestion(self, fixer, tmp_path):
+        """A cached suggestion is not reused after CUSTOM_PROMPT changes."""
+        analyzed = []
+
+        def analyze(context):
+            analyzed.append(context)
+            return FixSuggestion(
+                reason="r",
+                fix_type=FixType.COMMAND,
+                command="make",
+                confidence=0.8,
+                changes_summary="s",
+            )
+
+        fixer._fixer = SimpleNamespace(analyze=analyze)
+        cmd = [sys.executable, "-c", "import sys; sys.exit('boom')"]
+
+        fixer.run_pipeline(cmd, cwd=tmp_path)
+        fixer.run_pipeline(cmd, cwd=tmp_path)
+        assert len(analyzed) == 1
+
+        fixer.config.CUSTOM_PROMPT = "use the internal mirror"
+        fixer.run_pipeline(cmd, cwd=tmp_path)
+        assert len(analyzed) == 2
@@ -0,0 +1,135 @@
+"""Tests for Executor."""
+
+import subprocess
+import sys
+import threading
+
+from fix_compile.executor import Executor
+from fix_compile.schema import DockerBuildConfig
+
+# 交错写入约 1 MiB stderr 和少量 stdout（含非 UTF-8 字节），远超管道缓冲区
+_CHATTY_SCRIPT = """
+import sys
+out, err = sys.stdout.buffer, sys.stderr.buffer
+for i in range(2000):
+    err.write(b"E%05d " % i + b"x" * 500 + b"\\n")
+    err.flush()
+    out.write(b"O%05d \\xe4\\xbd\\xa0\\xff\\n" % i)
+    out.flush()
+"""
+_EXPECTED_STDOUT = b"".join(b"O%05d \xe4\xbd\xa0\xff\n" % i for i in range(2000))
+_EXPECTED_STDERR = b"".join(b"E%05d " % i + b"x" * 500 + b"\n" for i in range(2000))
+# Generous bound: a deadlock would block forever
+_TIMEOUT = 60
+
+
+def _run_with_timeout(fn, *args, **kwargs):
+    """Run fn in a daemon thread; fail instead of hanging if it deadlocks."""
+    outcome = {}
+
+    def target():
+        try:
+            outcome["value"] = fn(*args, **kwargs)
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(_TIMEOUT)
+    assert not thread.is_alive(), f"no result after {_TIMEOUT}s (deadlock?)"
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["value"]
+
+
+class TestStreamOutput:
+    """Concurrent draining of stdout and stderr."""
+
+    def test_chatty_stderr(self, tmp_path):
+        """Interleaved output is captured byte for byte without deadlocking."""
+        process = subprocess.Popen(
+            [sys.executable, "-c", _CHATTY_SCRIPT],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=0,
+        )
+        with (
+            open(tmp_path / "stdout.txt", "wb") as f_out,
+            open(tmp_path / "stderr.txt", "wb") as f_err,
+        ):
+            try:
+                stdout, stderr = _run_with_timeout(
+                    Executor._stream_output, process, f_out, f_err
+                )
+            finally:
+                process.kill()
+                process.wait()
+
+        assert stdout == _EXPECTED_STDOUT
+        assert stderr == _EXPECTED_STDERR
+        assert (tmp_path / "stdout.txt").read_bytes() == _EXPECTED_STDOUT
+        assert (tmp_path / "stderr.txt").read_bytes() == _EXPECTED_STDERR
+
+    def test_execute_writes_logs(self, tmp_path):
+        """execute() streams raw bytes to the log files and decodes the result."""
+        result = _run_with_timeout(
+            Executor().execute, [sys.executable, "-c", _CHATTY_SCRIPT], log_dir=tmp_path
+        )
+
+        assert result.success
+        assert result.stdout == _EXPECTED_STDOUT.decode("utf-8", errors="replace")
+        assert result.stderr == _EXPECTED_STDERR.decode("utf-8")
+        assert (tmp_path / "stdout.txt").read_bytes() == _EXPECTED_STDOUT
+        assert (tmp_path / "stderr.txt").read_bytes() == _EXPECTED_STDERR
+
+
+class TestDockerBuildEnv:
+    """BuildKit selection for docker build."""
+
+    def test_legacy_builder_by_default(self):
+        """Without buildkit the legacy builder is pinned."""
+        env = Executor.docker_build_env(DockerBuildConfig())
+
+        assert env["DOCKER_BUILDKIT"] == "0"
+
+    def test_buildkit_with_plain_progress(self):
+        """BuildKit runs with plain, line-oriented progress output."""
+        env = Executor.docker_build_env(DockerBuildConfig(buildkit=True))
+
+        assert env["DOCKER_BUILDKIT"] == "1"
+        assert env["BUILDKIT_PROGRESS"] == "plain"
+
+
+class TestDockerBuildArgs:
+    """docker build options built from DockerBuildConfig."""
+
+    def test_defaults(self):
+        """The default config adds no options."""
+        assert Executor.docker_build_args(DockerBuildConfig()) == []
+
+    def test_all_options(self):
+        """Every config field maps to its docker build flag, in order."""
+        config = DockerBuildConfig(
+            dockerfile="docker/Dockerfile",
+            tag="app:v1",
+            build_args={"VERSION": "1.0"},
+            no_cache=True,
+            cache_from=["type=local,src=/c1", "type=registry,ref=app:cache"],
+            cache_to="type=local,dest=/c1,mode=max",
+        )
+
+        assert Executor.docker_build_args(config) == [
+            "-t",
+            "app:v1",
+            "--no-cache",
+            "-f",
+            "docker/Dockerfile",
+            "--build-arg",
+            "VERSION=1.0",
+            "--cache-from",
+            "type=local,src=/c1",
+            "--cache-from",
+            "type=registry,ref=app:cache",
+            "--cache-to",
+            "type=local,dest=/c1,mode=max",
+        ]
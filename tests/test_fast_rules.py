@@ -0,0 +1,47 @@
+"""Tests for rule-based fixes."""
+
+from fix_compile.schema import FixType
+from fix_compile.workflows.fast_rules import match_rule
+
+SOCKET_LOG = (
+    "permission denied while trying to connect to the Docker daemon socket at "
+    "unix:///var/run/docker.sock: Get http://%2Fvar%2Frun%2Fdocker.sock/_ping"
+)
+DAEMON_LOG = (
+    "Cannot connect to the Docker daemon at unix:///var/run/docker.sock. "
+    "Is the docker daemon running?"
+)
+CMD = ["docker", "build", "-t", "my app", "."]
+
+
+class TestMatchRule:
+    """Matching of well-known Docker errors."""
+
+    def test_socket_permission(self):
+        """Socket permission errors rerun the command with sudo."""
+        fix = match_rule(SOCKET_LOG, CMD)
+
+        assert fix is not None
+        assert fix.fix_type == FixType.COMMAND
+        assert fix.command == "sudo docker build -t 'my app' ."
+
+    def test_daemon_not_running(self):
+        """An unreachable daemon is started first."""
+        fix = match_rule(DAEMON_LOG, CMD)
+
+        assert fix is not None
+        assert fix.command == "sudo systemctl start docker"
+        assert "docker build -t 'my app' ." in fix.command_explanation
+
+    def test_no_match(self):
+        """Other errors are left to the LLM."""
+        log = "ERROR: failed to solve: process did not complete successfully"
+
+        assert match_rule(log, CMD) is None
+
+    def test_first_rule_wins(self):
+        """A log matching several rules gets the fix of the first one."""
+        fix = match_rule(f"{DAEMON_LOG}\n{SOCKET_LOG}", CMD)
+
+        assert fix is not None
+        assert fix.command.startswith("sudo docker build")
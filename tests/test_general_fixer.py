@@ -0,0 +1,56 @@
+"""Tests for error log trimming in the general fixer."""
+
+from fix_compile.workflows.general_fixer import _trim_error_log
+
+
+def _kept(trimmed: str) -> list[str]:
+    """Log lines of a trimmed log, without the omission markers."""
+    return [line for line in trimmed.splitlines() if not line.startswith("... (")]
+
+
+class TestTrimErrorLog:
+    """Windows kept by _trim_error_log."""
+
+    def test_short_log_unchanged(self):
+        """Logs within the budget are returned as is."""
+        log = "\n".join(f"step {i}" for i in range(10))
+
+        assert _trim_error_log(log, max_lines=10) == log
+
+    def test_head_window_starts_before_first_error(self):
+        """The window keeps context lines before the first error marker."""
+        lines = [f"step {i}" for i in range(1000)]
+        lines[100] = "ERROR: root cause"
+        kept = _kept(_trim_error_log("\n".join(lines), max_lines=200))
+
+        assert kept[0] == "step 90"
+        assert "ERROR: root cause" in kept
+
+    def test_tail_kept(self):
+        """The last lines (final status) are always kept."""
+        lines = [f"step {i}" for i in range(1000)]
+        kept = _kept(_trim_error_log("\n".join(lines), max_lines=200))
+
+        assert kept[-75:] == lines[-75:]
+
+    def test_middle_error_lines_within_budget(self):
+        """Distinct middle errors are kept without exceeding max_lines."""
+        lines = [f"step {i}" for i in range(1000)]
+        lines[0] = "ERROR: root cause"
+        for i in range(300, 700):
+            lines[i] = f"error: failure {i % 80}"
+        trimmed = _trim_error_log("\n".join(lines), max_lines=200)
+        kept = _kept(trimmed)
+
+        assert len(kept) == 200
+        assert "error: failure 0" in kept
+        assert len(set(kept)) == len(kept)
+        assert "800 lines omitted, 50 error lines kept" in trimmed
+
+    def test_error_near_end_keeps_last_lines(self):
+        """An error close to the tail falls back to the last max_lines lines."""
+        lines = [f"step {i}" for i in range(1000)]
+        lines[990] = "ERROR: late failure"
+        kept = _kept(_trim_error_log("\n".join(lines), max_lines=200))
+
+        assert kept == lines[-200:]
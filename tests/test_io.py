@@ -0,0 +1,55 @@
+"""Tests for fix_compile.utils.io helpers."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from fix_compile.schema import FixSuggestion, FixType
+from fix_compile.utils.io import (
+    is_cacheable_suggestion,
+    suggestion_key,
+    suggestion_settings,
+)
+
+
+def _suggestion(confidence: float) -> FixSuggestion:
+    return FixSuggestion(
+        reason="r",
+        fix_type=FixType.COMMAND,
+        command="make",
+        confidence=confidence,
+        changes_summary="s",
+    )
+
+
+def test_zero_confidence_suggestion_is_not_cacheable():
+    """The empty-response fallback must never be persisted."""
+    assert not is_cacheable_suggestion(_suggestion(0.0))
+
+
+def test_confident_suggestion_is_cacheable():
+    """Regular suggestions are cached."""
+    assert is_cacheable_suggestion(_suggestion(0.8))
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        {"FIXER_MODEL": "other-model"},
+        {"CUSTOM_PROMPT": "use the internal mirror"},
+        {"OPENAI_API_BASE": "http://localhost:8000/v1"},
+    ],
+)
+def test_settings_change_suggestion_key(change):
+    """Model, custom prompt and endpoint each invalidate cached suggestions."""
+    settings = {
+        "FIXER_MODEL": "model",
+        "CUSTOM_PROMPT": "",
+        "OPENAI_API_BASE": "https://api.example.com/v1",
+    }
+    before = SimpleNamespace(**settings)
+    after = SimpleNamespace(**{**settings, **change})
+
+    assert suggestion_key("log", *suggestion_settings(before)) != suggestion_key(
+        "log", *suggestion_settings(after)
+    )
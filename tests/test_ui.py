@@ -0,0 +1,22 @@
+"""Tests for console output helpers."""
+
+from fix_compile.utils import ui
+
+
+class TestConfidence:
+    """Styling of the confidence line."""
+
+    def test_only_icon_and_score_are_styled(self, monkeypatch):
+        """The label keeps the default style; icon is blue, score colored."""
+        printed = []
+        monkeypatch.setattr(ui.console, "print", printed.append)
+
+        ui.confidence(0.85)
+
+        (text,) = printed
+        assert text.plain == "ℹ Confidence: 85%"
+        assert text.style == ""
+        assert [(text.plain[s.start : s.end], s.style) for s in text.spans] == [
+            ("ℹ", "blue"),
+            ("85%", "green"),
+        ]